@@ -7,6 +7,7 @@ from cortex.agents.agent_factory import AgentFactory
 from cortex.orchestrator.orchestrator import Orchestrator
 from cortex.server.http_server import HttpServer
 from demo.dr_agent.dr_agent import get_dr_agent_config, make_dr_agent
+from demo.tools.utils import http_session_scope
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +41,8 @@ async def main():
         f"Demo server started: http://localhost:{args.port} (press Ctrl+C to stop)",
         flush=True,
     )
-    await http_server.start(port=args.port)
+    async with http_session_scope():
+        await http_server.start(port=args.port)
 
 
 if __name__ == "__main__":
@@ -157,7 +157,7 @@ def format_open_results(result: BatchOpenResult) -> str:
                         if format_result.is_truncated:
                             BATCH_OPEN_TMP_DIR.mkdir(parents=True, exist_ok=True)
                             tmp_file = BATCH_OPEN_TMP_DIR / f"{_save_unique_name}_page_{idx}.md"
-                            tmp_file.write_text(markdown, encoding="utf-8")
+                            tmp_file.write_bytes(format_result.raw_bytes)
                             lines.append(
                                 f"<full_content_file>内容因过长被截断，完整内容请查看临时文件：{tmp_file}</full_content_file>"
                             )
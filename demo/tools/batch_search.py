@@ -5,7 +5,7 @@ from pathlib import Path
 from urllib.parse import urlparse
 
 from loguru import logger
-from typing import TypedDict
+from typing_extensions import NotRequired, TypedDict
 import asyncio
 
 from demo.tools.search import SearchResult, search
@@ -15,34 +15,44 @@ from demo.tools.text_truncator import format_content
 # 批量搜索结果临时文件目录
 BATCH_SEARCH_TMP_DIR = Path("/tmp/web_surfer/batch_search")
 
+# 单个查询的超时时间（秒），超时未返回的查询按空结果处理
+BATCH_SEARCH_QUERY_TIMEOUT = 30
 
-def _generate_cite_index(query_idx: int, item_idx: int, url: str) -> str:
-    """生成唯一的引用索引"""
-    hash_input = f"{query_idx}_{item_idx}_{url}"
-    return f"web_{hashlib.md5(hash_input.encode()).hexdigest()[:8]}"
+
+def _cite_index_prefix(query_idx: int) -> hashlib.blake2b:
+    """生成查询级别的引用索引哈希前缀，供同一查询下的结果项复制复用"""
+    return hashlib.blake2b(f"{query_idx}_".encode(), digest_size=4)
+
+
+def _generate_cite_index(prefix: hashlib.blake2b, item_idx: int, url: str) -> str:
+    """基于查询前缀哈希状态生成唯一的引用索引"""
+    h = prefix.copy()
+    h.update(f"{item_idx}_{url}".encode())
+    return f"web_{h.hexdigest()}"
 
 
 class BatchSearchResult(TypedDict):
     search_results: list[SearchResult]
     message: str
+    # 超时的查询在 search_results 中的下标
+    timed_out: NotRequired[list[int]]
 
 
-def _deduplicate_results(search_results: list[SearchResult]) -> None:
-    """对搜索结果进行 URL 去重（原地修改）
+def _deduplicate_result(search_result: SearchResult, seen_urls: set[str]) -> None:
+    """对单个查询的搜索结果进行 URL 去重（原地修改）
 
     Args:
-        search_results: 搜索结果列表
+        search_result: 单个查询的搜索结果
+        seen_urls: 之前查询中已出现过的 URL，会被同步更新
     """
-    seen_urls: set[str] = set()
-    for search_result in search_results:
-        results = search_result.get("results", [])
-        filtered_results = []
-        for item in results:
-            url = item.get("url", "")
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                filtered_results.append(item)
-        search_result["results"] = filtered_results
+    results = search_result["results"]
+    filtered_results = []
+    for item in results:
+        url = item["url"]
+        if url and url not in seen_urls:
+            seen_urls.add(url)
+            filtered_results.append(item)
+    search_result["results"] = filtered_results
 
 
 def _rerank(search_results: list[SearchResult], topk: int) -> None:
@@ -58,34 +68,28 @@ def _rerank(search_results: list[SearchResult], topk: int) -> None:
     """
     n_queries = len(search_results)
     base_quota = topk // n_queries
-    remaining = topk
 
-    # 第一轮：按基础配额分配
-    actual_counts = []
-    for search_result in search_results:
-        available = len(search_result.get("results", []))
-        take = min(available, base_quota)
-        actual_counts.append(take)
-        remaining -= take
+    # 第一轮：按基础配额分配（去重后的可用数量只统计一次）
+    availables = [len(search_result["results"]) for search_result in search_results]
+    actual_counts = [min(available, base_quota) for available in availables]
+    remaining = topk - sum(actual_counts)
 
     # 第二轮：将剩余配额分配给有更多结果的查询
-    if remaining > 0:
-        for i, search_result in enumerate(search_results):
-            if remaining <= 0:
-                break
-            available = len(search_result.get("results", []))
-            extra = min(available - actual_counts[i], remaining)
-            if extra > 0:
-                actual_counts[i] += extra
-                remaining -= extra
+    for i, available in enumerate(availables):
+        if remaining <= 0:
+            break
+        extra = min(available - actual_counts[i], remaining)
+        if extra > 0:
+            actual_counts[i] += extra
+            remaining -= extra
 
     # 应用配额
-    for i, search_result in enumerate(search_results):
-        results = search_result.get("results", [])
-        search_result["results"] = results[:actual_counts[i]]
+    for search_result, available, count in zip(search_results, availables, actual_counts):
+        if count < available:
+            search_result["results"] = search_result["results"][:count]
         logger.debug(
-            f"{search_result['query']}: {len(results)} available, "
-            f"taking {actual_counts[i]} results"
+            "{}: {} available, taking {} results",
+            search_result["query"], available, count,
         )
 
 
@@ -110,13 +114,38 @@ async def batch_search(
     Returns:
         BatchSearchResult: 批量搜索结果
     """
-    # 并行执行所有搜索
-    search_results = await asyncio.gather(
-        *[search(query, topk=topk) for query in querys]
-    )
-
-    # URL 去重
-    _deduplicate_results(search_results)
+    # 并行执行所有搜索（每个查询单独超时），结果按完成顺序收集
+    pending = {
+        asyncio.create_task(
+            asyncio.wait_for(search(query, topk=topk), BATCH_SEARCH_QUERY_TIMEOUT)
+        ): idx
+        for idx, query in enumerate(querys)
+    }
+    search_results: list[SearchResult | None] = [None] * len(querys)
+    timed_out: list[int] = []
+    seen_urls: set[str] = set()
+    next_idx = 0
+
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                idx = pending.pop(task)
+                try:
+                    search_results[idx] = task.result()
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        f"batch_search: 查询 '{querys[idx]}' 超过 {BATCH_SEARCH_QUERY_TIMEOUT}s 未返回，按空结果处理"
+                    )
+                    timed_out.append(idx)
+                    search_results[idx] = {"query": querys[idx], "results": []}
+            # 按查询顺序增量去重，与仍在进行中的请求重叠执行
+            while next_idx < len(search_results) and search_results[next_idx] is not None:
+                _deduplicate_result(search_results[next_idx], seen_urls)
+                next_idx += 1
+    finally:
+        for task in pending:
+            task.cancel()
 
     # 重排序
     _rerank(search_results, topk)
@@ -124,6 +153,7 @@ async def batch_search(
     return BatchSearchResult(
         search_results=search_results,
         message="success",
+        timed_out=sorted(timed_out),
     )
 
 
@@ -142,6 +172,7 @@ def format_search_results(result: BatchSearchResult) -> str:
         格式化后的批量搜索结果 XML 文本
     """
     search_results = result["search_results"]
+    timed_out = set(result.get("timed_out", ()))
 
     lines: list[str] = []
 
@@ -150,7 +181,7 @@ def format_search_results(result: BatchSearchResult) -> str:
 
     # 添加批量搜索的元信息
     lines.append("<batch_metadata>")
-    total_items = sum(len(r.get("results", [])) for r in search_results)
+    total_items = sum(len(r["results"]) for r in search_results)
     lines.append(f"共 {len(search_results)} 个查询，{total_items} 个搜索结果")
     lines.append("</batch_metadata>")
 
@@ -162,8 +193,9 @@ def format_search_results(result: BatchSearchResult) -> str:
         # 格式化每个查询的搜索结果
         for query_idx, r in enumerate(search_results, 1):
             lines.append(f'<query_result index="{query_idx}">')
+            cite_prefix = _cite_index_prefix(query_idx)
 
-            results = r.get("results", [])
+            results = r["results"]
             
             # 添加查询元信息
             lines.append("<query_metadata>")
@@ -172,7 +204,11 @@ def format_search_results(result: BatchSearchResult) -> str:
             lines.append("</query_metadata>")
 
             # 如果这个查询没有搜索结果
-            if not results:
+            if query_idx - 1 in timed_out:
+                lines.append(
+                    f"<no_results_found>查询 '{r['query']}' 超时未返回，没有获取到搜索结果！</no_results_found>"
+                )
+            elif not results:
                 lines.append(
                     f"<no_results_found>查询 '{r['query']}' 没有发现搜索结果！</no_results_found>"
                 )
@@ -182,10 +218,10 @@ def format_search_results(result: BatchSearchResult) -> str:
                 for item_idx, item in enumerate(results, 1):
                     # 提取核心信息
                     title = item.get("title", "无标题")
-                    url = item.get("url", "")
-                    snippet = item.get("snippet", "")
-                    content = item.get("content", "")
-                    time = item.get("time", "")
+                    url = item["url"]
+                    snippet = item["snippet"]
+                    content = item["content"]
+                    time = item["time"]
 
                     # 从 URL 提取 site
                     site = ""
@@ -197,7 +233,7 @@ def format_search_results(result: BatchSearchResult) -> str:
                             pass
 
                     # 生成引用索引
-                    cite_index = _generate_cite_index(query_idx, item_idx, url)
+                    cite_index = _generate_cite_index(cite_prefix, item_idx, url)
 
                     # 构建结果项
                     lines.append(f'<item index="{item_idx}">')
@@ -231,7 +267,7 @@ def format_search_results(result: BatchSearchResult) -> str:
                         if format_result.is_truncated:
                             BATCH_SEARCH_TMP_DIR.mkdir(parents=True, exist_ok=True)
                             tmp_file = BATCH_SEARCH_TMP_DIR / f"{_save_unique_name}-query_{query_idx}-item_{item_idx}.md"
-                            tmp_file.write_text(content, encoding="utf-8")
+                            tmp_file.write_bytes(format_result.raw_bytes)
                             lines.append(
                                 f"<full_content_file>内容因过长被截断，完整内容请查看临时文件：{tmp_file}</full_content_file>"
                             )
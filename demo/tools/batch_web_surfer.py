@@ -3,10 +3,10 @@ from typing import Annotated, Literal
 
 from loguru import logger
 
-from cortex.model.definition import ContentBlockType
 from cortex.tools.function_tool import FunctionTool
 from .batch_open import batch_open, format_open_results
 from .batch_search import batch_search, format_search_results
+from .utils import wrap_tool_result
 
 
 def _ensure_list(value: list[str] | str | None) -> list[str]:
@@ -28,6 +28,27 @@ def _ensure_list(value: list[str] | str | None) -> list[str]:
     return []
 
 
+async def _run_search(queries: list[str], urls: list[str], topk: int):
+    """Run batch_search after validating its required arguments."""
+    if not queries:
+        raise ValueError("batch_search action requires a list of queries")
+    return await batch_search(querys=queries, topk=topk)
+
+
+async def _run_open(queries: list[str], urls: list[str], topk: int):
+    """Run batch_open after validating its required arguments."""
+    if not urls:
+        raise ValueError("batch_open action requires a list of URLs")
+    return await batch_open(urls=urls)
+
+
+# action -> (executor, formatter)
+_DISPATCH = {
+    "batch_search": (_run_search, format_search_results),
+    "batch_open": (_run_open, format_open_results),
+}
+
+
 async def batch_web_surfer(
         action: Annotated[Literal["batch_search", "batch_open"], "要执行的批量操作类型"],
         queries: Annotated[list[str] | None, "batch_search 时必须提供，要搜索的查询内容列表"] = None,
@@ -58,45 +79,18 @@ async def batch_web_surfer(
     queries_list = _ensure_list(queries)
     urls_list = _ensure_list(urls)
 
-    match action:
-        case "batch_search":
-            if not queries_list:
-                raise ValueError(
-                    "batch_search action requires a list of queries"
-                )
-
-            # Execute batch search
-            raw_result = await batch_search(querys=queries_list, topk=topk)
-
-            # Format results
-            formatted_result = format_search_results(raw_result)
-
-        case "batch_open":
-            if not urls_list:
-                raise ValueError("batch_open action requires a list of URLs")
-
-            # Execute batch open
-            raw_result = await batch_open(urls=urls_list)
-
-            # Format results
-            formatted_result = format_open_results(raw_result)
-
-        case _:
-            raise ValueError(
-                f"Invalid action parameter: {action}, must be 'batch_search' or 'batch_open'"
-            )
-    result = [
-        {
-            "type": ContentBlockType.TOOLRESULT.value,
-            "content": [
-                {
-                    "type": ContentBlockType.TEXT.value,
-                    ContentBlockType.TEXT.value: formatted_result,
-                }
-            ]
-        }
-    ]
-    return result
+    handler = _DISPATCH.get(action)
+    if handler is None:
+        raise ValueError(
+            f"Invalid action parameter: {action}, must be 'batch_search' or 'batch_open'"
+        )
+    runner, formatter = handler
+
+    # Execute batch action and format results
+    raw_result = await runner(queries_list, urls_list, topk)
+    formatted_result = formatter(raw_result)
+
+    return wrap_tool_result(formatted_result)
 
 
 def create_batch_web_surfer_tool():
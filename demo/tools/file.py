@@ -5,35 +5,32 @@ Provides read/write/append/list/stat operations with an action + path schema.
 
 from __future__ import annotations
 
+import asyncio
+import heapq
 import os
-from datetime import datetime
+import stat
+import time
 from pathlib import Path
 from typing import Annotated, Literal
 
 from loguru import logger
 
-from cortex.model.definition import ContentBlockType
 from cortex.tools.function_tool import FunctionTool
+from demo.tools.utils import wrap_tool_result
 
 MAX_PREVIEW_BYTES = 12000
 MAX_LIST_ENTRIES = 200
+_LIST_SEPARATOR = "-" * 60
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 
-def _wrap_tool_result(text: str) -> list[dict]:
-    return [
-        {
-            "type": ContentBlockType.TOOLRESULT.value,
-            "content": [
-                {
-                    "type": ContentBlockType.TEXT.value,
-                    ContentBlockType.TEXT.value: text,
-                }
-            ],
-        }
-    ]
+_ASCII_COMPATIBLE_ENCODINGS = frozenset({"utf-8", "utf8", "ascii", "us-ascii"})
 
 
 def _safe_decode(data: bytes, encoding: str) -> tuple[str, bool]:
+    # Pure-ASCII previews decode identically under these encodings and cannot fail
+    if data.isascii() and encoding.lower() in _ASCII_COMPATIBLE_ENCODINGS:
+        return data.decode("ascii"), False
     try:
         return data.decode(encoding), False
     except UnicodeDecodeError:
@@ -42,14 +39,19 @@ def _safe_decode(data: bytes, encoding: str) -> tuple[str, bool]:
         return decoded, True
 
 
+def _format_timestamp(timestamp: float) -> str:
+    return time.strftime(_TIMESTAMP_FORMAT, time.localtime(timestamp))
+
+
+_BYTE_UNITS = ("B", "KB", "MB", "GB")
+
+
 def _format_bytes(size: int) -> str:
-    units = ["B", "KB", "MB", "GB"]
-    value = float(size)
-    for unit in units:
-        if value < 1024 or unit == units[-1]:
-            return f"{value:.2f}{unit}"
-        value /= 1024
-    return f"{size}B"
+    if size < 1024:
+        return f"{size:.2f}B"
+    # Every 10 bits is one 1024x unit step
+    idx = min((size.bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    return f"{size / (1 << (idx * 10)):.2f}{_BYTE_UNITS[idx]}"
 
 
 def _format_read_result(
@@ -60,57 +62,50 @@ def _format_read_result(
     limit: int,
     had_decode_issue: bool,
 ) -> str:
-    lines: list[str] = ["<file_result>"]
-    lines.append(f"action: read")
-    lines.append(f"path: {path}")
-    lines.append(f"size: {_format_bytes(size_bytes)}")
+    notes = ""
     if had_decode_issue:
-        lines.append("note: binary or non-utf8 data was replaced with '?'")
+        notes += "note: binary or non-utf8 data was replaced with '?'\n"
     if truncated:
-        lines.append(f"note: output truncated to first {limit} bytes")
-    lines.append("")
-    lines.append("```")
-    lines.append(text)
-    lines.append("```")
-    lines.append("</file_result>")
-    return "\n".join(lines)
+        notes += f"note: output truncated to first {limit} bytes\n"
+    return (
+        "<file_result>\n"
+        "action: read\n"
+        f"path: {path}\n"
+        f"size: {_format_bytes(size_bytes)}\n"
+        f"{notes}"
+        "\n"
+        "```\n"
+        f"{text}\n"
+        "```\n"
+        "</file_result>"
+    )
 
 
 def _format_write_result(path: Path, action: str, size: int) -> str:
-    lines = ["<file_result>"]
-    lines.append(f"action: {action}")
-    lines.append(f"path: {path}")
-    lines.append(f"size: {_format_bytes(size)}")
-    lines.append(f"message: {action} successful")
-    lines.append("</file_result>")
-    return "\n".join(lines)
+    return (
+        "<file_result>\n"
+        f"action: {action}\n"
+        f"path: {path}\n"
+        f"size: {_format_bytes(size)}\n"
+        f"message: {action} successful\n"
+        "</file_result>"
+    )
 
 
 def _format_stat_result(path: Path, stat_result: os.stat_result) -> str:
-    lines = ["<file_result>"]
-    lines.append("action: stat")
-    lines.append(f"path: {path}")
-    lines.append(f"size: {_format_bytes(stat_result.st_size)}")
-    modified = datetime.fromtimestamp(stat_result.st_mtime).isoformat(
-        sep=" ", timespec="seconds"
-    )
-    created = datetime.fromtimestamp(stat_result.st_ctime).isoformat(
-        sep=" ", timespec="seconds"
+    return (
+        "<file_result>\n"
+        "action: stat\n"
+        f"path: {path}\n"
+        f"size: {_format_bytes(stat_result.st_size)}\n"
+        f"modified: {_format_timestamp(stat_result.st_mtime)}\n"
+        f"created: {_format_timestamp(stat_result.st_ctime)}\n"
+        "</file_result>"
     )
-    lines.append(f"modified: {modified}")
-    lines.append(f"created: {created}")
-    lines.append("</file_result>")
-    return "\n".join(lines)
 
 
 def _format_list_result(path: Path, entries: list[os.DirEntry]) -> str:
-    lines = ["<file_result>"]
-    lines.append("action: list")
-    lines.append(f"path: {path}")
-    lines.append(f"entries: showing {len(entries)} item(s)")
-    lines.append("")
-    lines.append("name | type | size | modified")
-    lines.append("-" * 60)
+    rows: list[str] = []
     for entry in entries:
         try:
             stat_result = entry.stat()
@@ -118,12 +113,106 @@ def _format_list_result(path: Path, entries: list[os.DirEntry]) -> str:
             continue
         kind = "dir" if entry.is_dir() else "file"
         size = _format_bytes(stat_result.st_size)
-        mtime = datetime.fromtimestamp(stat_result.st_mtime).isoformat(
-            sep=" ", timespec="seconds"
+        mtime = _format_timestamp(stat_result.st_mtime)
+        rows.append(f"{entry.name} | {kind} | {size} | {mtime}\n")
+    return (
+        "<file_result>\n"
+        "action: list\n"
+        f"path: {path}\n"
+        f"entries: showing {len(entries)} item(s)\n"
+        "\n"
+        "name | type | size | modified\n"
+        f"{_LIST_SEPARATOR}\n"
+        f"{''.join(rows)}"
+        "</file_result>"
+    )
+
+
+def _do_read(resolved_path: Path, preview_limit: int | None, encoding: str) -> str:
+    # A single stat answers existence, type and size
+    try:
+        stat_result = os.stat(resolved_path)
+    except (FileNotFoundError, NotADirectoryError):
+        return (
+            "<file_result>action: read\n"
+            f"path: {resolved_path}\nerror: file not found</file_result>"
+        )
+    if not stat.S_ISREG(stat_result.st_mode):
+        return (
+            "<file_result>action: read\n"
+            f"path: {resolved_path}\nerror: target is not a file</file_result>"
+        )
+    # Pseudo files (e.g. /proc) report st_size 0, so read them whole to learn their size
+    if preview_limit is None or stat_result.st_size == 0:
+        with open(resolved_path, "rb", buffering=0) as f:
+            preview = f.readall()
+    else:
+        # Only read what will be shown (+1 byte to detect truncation)
+        fd = os.open(resolved_path, os.O_RDONLY)
+        try:
+            preview = os.pread(fd, preview_limit + 1, 0)
+        finally:
+            os.close(fd)
+    size_bytes = stat_result.st_size or len(preview)
+    truncated = preview_limit is not None and len(preview) > preview_limit
+    if truncated:
+        preview = preview[:preview_limit]
+    decoded, had_decode_issue = _safe_decode(preview, encoding)
+    return _format_read_result(
+        resolved_path,
+        decoded,
+        size_bytes,
+        truncated,
+        preview_limit or 0,
+        had_decode_issue,
+    )
+
+
+def _do_write(resolved_path: Path, action: str, content: str, encoding: str) -> str:
+    resolved_path.parent.mkdir(parents=True, exist_ok=True)
+    # Encode once and write the payload without a text layer; the buffered
+    # writer retries short writes, so the whole payload always lands on disk
+    data = content.encode(encoding)
+    mode = "ab" if action == "append" else "wb"
+    with open(resolved_path, mode) as f:
+        f.write(data)
+        # After an O_APPEND write the offset is the new end of file
+        size = f.tell() if action == "append" else len(data)
+    return _format_write_result(resolved_path, action, size)
+
+
+def _do_stat(resolved_path: Path) -> str:
+    if not resolved_path.exists():
+        return (
+            "<file_result>action: stat\n"
+            f"path: {resolved_path}\nerror: file not found</file_result>"
+        )
+    return _format_stat_result(resolved_path, resolved_path.stat())
+
+
+def _do_list(resolved_path: Path) -> str:
+    target = resolved_path
+    if not target.exists():
+        return (
+            "<file_result>action: list\n"
+            f"path: {target}\nerror: path not found</file_result>"
+        )
+    if target.is_file():
+        target = target.parent
+    try:
+        # DirEntry keeps the d_type/stat data from readdir, unlike Path.iterdir()
+        with os.scandir(target) as it:
+            # Keep only the first MAX_LIST_ENTRIES by name: O(N log K), K-bounded memory
+            entries = heapq.nsmallest(
+                MAX_LIST_ENTRIES, it, key=lambda e: e.name.lower()
+            )
+    except PermissionError as exc:
+        logger.warning(f"list permission error on {target}: {exc}")
+        return (
+            "<file_result>action: list\n"
+            f"path: {target}\nerror: permission denied</file_result>"
         )
-        lines.append(f"{entry.name} | {kind} | {size} | {mtime}")
-    lines.append("</file_result>")
-    return "\n".join(lines)
+    return _format_list_result(target, entries)
 
 
 async def file(
@@ -151,86 +240,29 @@ async def file(
     if not resolved_path.is_absolute():
         resolved_path = (Path.cwd() / resolved_path).resolve()
 
+    # Blocking filesystem work runs in a worker thread to keep the loop free
     action_normalized = action.lower()
     if action_normalized == "read":
-        if not resolved_path.exists():
-            msg = (
-                "<file_result>action: read\n"
-                f"path: {resolved_path}\nerror: file not found</file_result>"
-            )
-            return _wrap_tool_result(msg)
-        if not resolved_path.is_file():
-            msg = (
-                "<file_result>action: read\n"
-                f"path: {resolved_path}\nerror: target is not a file</file_result>"
-            )
-            return _wrap_tool_result(msg)
-        data = resolved_path.read_bytes()
         preview_limit = limit if limit and limit > 0 else None
-        preview = data if preview_limit is None else data[:preview_limit]
-        decoded, had_decode_issue = _safe_decode(preview, encoding)
-        truncated = preview_limit is not None and len(data) > preview_limit
-        formatted = _format_read_result(
-            resolved_path,
-            decoded,
-            len(data),
-            truncated,
-            preview_limit or 0,
-            had_decode_issue,
+        formatted = await asyncio.to_thread(
+            _do_read, resolved_path, preview_limit, encoding
         )
-        return _wrap_tool_result(formatted)
-
-    if action_normalized in {"write", "append"}:
-        resolved_path.parent.mkdir(parents=True, exist_ok=True)
-        mode = "a" if action_normalized == "append" else "w"
-        resolved_path.open(mode, encoding=encoding).write(content)
-        size = resolved_path.stat().st_size
-        formatted = _format_write_result(resolved_path, action_normalized, size)
-        return _wrap_tool_result(formatted)
-
-    if action_normalized == "stat":
-        if not resolved_path.exists():
-            msg = (
-                "<file_result>action: stat\n"
-                f"path: {resolved_path}\nerror: file not found</file_result>"
-            )
-            return _wrap_tool_result(msg)
-        stat_result = resolved_path.stat()
-        formatted = _format_stat_result(resolved_path, stat_result)
-        return _wrap_tool_result(formatted)
-
-    if action_normalized == "list":
-        target = resolved_path
-        if not target.exists():
-            msg = (
-                "<file_result>action: list\n"
-                f"path: {target}\nerror: path not found</file_result>"
-            )
-            return _wrap_tool_result(msg)
-        if target.is_file():
-            target = target.parent
-        try:
-            entries = sorted(
-                list(target.iterdir()),
-                key=lambda e: e.name.lower(),
-            )[:MAX_LIST_ENTRIES]
-        except PermissionError as exc:
-            logger.warning(f"list permission error on {target}: {exc}")
-            msg = (
-                "<file_result>action: list\n"
-                f"path: {target}\nerror: permission denied</file_result>"
-            )
-            return _wrap_tool_result(msg)
-        formatted = _format_list_result(target, entries)
-        return _wrap_tool_result(formatted)
-
-    msg = (
-        "<file_result>"
-        f"error: unsupported action '{action}'."
-        " supported: read, write, append, list, stat"
-        "</file_result>"
-    )
-    return _wrap_tool_result(msg)
+    elif action_normalized in {"write", "append"}:
+        formatted = await asyncio.to_thread(
+            _do_write, resolved_path, action_normalized, content, encoding
+        )
+    elif action_normalized == "stat":
+        formatted = await asyncio.to_thread(_do_stat, resolved_path)
+    elif action_normalized == "list":
+        formatted = await asyncio.to_thread(_do_list, resolved_path)
+    else:
+        formatted = (
+            "<file_result>"
+            f"error: unsupported action '{action}'."
+            " supported: read, write, append, list, stat"
+            "</file_result>"
+        )
+    return wrap_tool_result(formatted)
 
 
 def create_file_tool() -> FunctionTool:
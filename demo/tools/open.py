@@ -1,19 +1,25 @@
 import asyncio
 import os
+from io import BytesIO, FileIO
 from typing import Optional
 from urllib.parse import urlparse
 
-import aiofiles
 import aiohttp
 import megfile
 from loguru import logger
 from markitdown import MarkItDown
 from typing_extensions import TypedDict
 
+from demo.tools.utils import http_session
+
 
 # Default proxy and timeout configuration
 _DEFAULT_PROXY = os.getenv("HTTP_PROXY", "")
 _OPEN_URL_TIMEOUT = 30
+# Chunk size used when streaming HTTP response bodies
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Maximum accepted response body size, larger downloads are aborted
+_MAX_CONTENT_BYTES = 50 * 1024 * 1024
 
 
 class Page(TypedDict, total=False):
@@ -45,12 +51,12 @@ def _make_error_result(code: int, message: str, url: str) -> OpenResult:
     )
 
 
-async def _download_http(url: str, timeout: int = _OPEN_URL_TIMEOUT) -> bytes:
-    """Download content via HTTP with proxy support"""
+async def _download_http(url: str, timeout: int = _OPEN_URL_TIMEOUT) -> BytesIO:
+    """Download content via HTTP with proxy support, streaming the body into a buffer"""
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
     }
-    async with aiohttp.ClientSession() as session:
+    async with http_session() as session:
         async with session.get(
             url,
             headers=headers,
@@ -58,7 +64,19 @@ async def _download_http(url: str, timeout: int = _OPEN_URL_TIMEOUT) -> bytes:
             proxy=_DEFAULT_PROXY if _DEFAULT_PROXY else None,
         ) as response:
             response.raise_for_status()
-            return await response.read()
+            if (response.content_length or 0) > _MAX_CONTENT_BYTES:
+                raise ValueError(
+                    f"Content too large: {response.content_length} bytes > {_MAX_CONTENT_BYTES} bytes"
+                )
+            buffer = BytesIO()
+            total = 0
+            async for chunk in response.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+                total += len(chunk)
+                if total > _MAX_CONTENT_BYTES:
+                    raise ValueError(f"Content too large: exceeded {_MAX_CONTENT_BYTES} bytes")
+                buffer.write(chunk)
+            buffer.seek(0)
+            return buffer
 
 
 def _download_s3(url: str) -> bytes:
@@ -67,26 +85,31 @@ def _download_s3(url: str) -> bytes:
         return f.read()
 
 
-async def _get_url_content_bytes(url: str, timeout: int = _OPEN_URL_TIMEOUT) -> bytes:
-    """Get URL content as bytes, supports S3, HTTP, and local files"""
+def _read_local_file(path: str) -> bytes:
+    """Read a local file in one unbuffered read, refusing files over the size cap"""
+    with FileIO(path, "r") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > _MAX_CONTENT_BYTES:
+            raise ValueError(f"Content too large: {size} bytes > {_MAX_CONTENT_BYTES} bytes")
+        return f.readall()
+
+
+async def _get_url_content_stream(url: str, timeout: int = _OPEN_URL_TIMEOUT) -> BytesIO:
+    """Get URL content as a binary stream, supports S3, HTTP, and local files"""
     if megfile.is_s3(url):
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _download_s3, url)
+        # BytesIO shares the bytes buffer until written to, so no extra copy
+        return BytesIO(await loop.run_in_executor(None, _download_s3, url))
     elif url.startswith("http://") or url.startswith("https://"):
         return await _download_http(url, timeout=timeout)
     else:
         # Local file
-        async with aiofiles.open(url, "rb") as f:
-            return await f.read()
+        return BytesIO(await asyncio.to_thread(_read_local_file, url))
 
 
-def _parse_content_to_markdown(content_bytes: bytes, url: str) -> str:
+def _parse_content_to_markdown(stream: BytesIO, url: str) -> str:
     """Parse content to markdown format"""
-    from io import BytesIO
-    
     md = MarkItDown()
-    # Convert bytes to BytesIO stream
-    stream = BytesIO(content_bytes)
     result = md.convert_stream(stream, file_extension=None)
     return result.text_content
 
@@ -104,11 +127,13 @@ async def open(url: str) -> OpenResult:
     host = parsed_url.netloc if parsed_url.netloc else ""
     
     try:
-        # Get content bytes
-        content_bytes = await _get_url_content_bytes(url)
+        # Get content stream
+        content_stream = await _get_url_content_stream(url)
         
-        # Parse to markdown
-        markdown_content = _parse_content_to_markdown(content_bytes, url)
+        # Parse to markdown (CPU-bound, keep it off the event loop)
+        markdown_content = await asyncio.to_thread(
+            _parse_content_to_markdown, content_stream, url
+        )
         
         # Construct success result
         return OpenResult(
@@ -4,6 +4,8 @@ import aiohttp
 from loguru import logger
 from typing_extensions import NotRequired, TypedDict
 
+from demo.tools.utils import http_session, json_loads
+
 
 class SearchResultItem(TypedDict):
     url: str
@@ -24,6 +26,24 @@ _DEFAULT_SEARCH_URL = os.getenv("STEP_SEARCH_API_BASE", "https://api.stepfun.com
 # Prefer the dedicated search key; fall back to legacy STEP_API_KEY for compatibility.
 _DEFAULT_AUTH_BEARER = os.getenv("STEP_SEARCH_API_KEY") or os.getenv("STEP_API_KEY", "")
 
+# Defaults filled into every result item so consumers can index keys directly.
+# "title" is left out: a missing title and an empty one are rendered differently.
+_EMPTY_ITEM_FIELDS = {
+    "url": "",
+    "time": "",
+    "snippet": "",
+    "content": "",
+}
+
+
+def _normalize_result(api_result: dict, query: str) -> SearchResult:
+    """Ensure the result and each of its items carry all expected keys."""
+    api_result.setdefault("query", query)
+    api_result["results"] = [
+        {**_EMPTY_ITEM_FIELDS, **item} for item in api_result.get("results") or []
+    ]
+    return api_result
+
 
 async def search(
         query: str,
@@ -41,6 +61,7 @@ async def search(
         
     Returns:
         SearchResult: Search results, returns empty list in results on error.
+            Every item is normalized to contain url/time/snippet/content.
     """
     """
     New API response format:
@@ -72,7 +93,7 @@ async def search(
     logger.debug(f"Searching with query: {query}, topk: {topk}")
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with http_session() as session:
             async with session.post(
                     base_url,
                     json=request_params,
@@ -88,11 +109,11 @@ async def search(
                         "query": query,
                         "results": [],
                     }
-                api_result = await response.json()
+                api_result = json_loads(await response.read())
                 if "error" in api_result:
                     logger.warning(f"Search API returned error: {api_result['error']}")
 
-                return api_result
+                return _normalize_result(api_result, query)
     except aiohttp.ClientError as e:
         logger.warning(f"Search request failed: {e}")
         return {
@@ -4,18 +4,21 @@ Supports executing shell commands on macOS and Linux, returning structured outpu
 """
 
 import asyncio
+import codecs
+import json
 import os
 import subprocess
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Annotated, cast
+from typing import Annotated, BinaryIO, TextIO
 
 from loguru import logger
 
 from cortex.model.definition import ContentBlockType
 from cortex.tools.function_tool import FunctionTool
+from demo.tools.utils import json_loads
 
 # Maximum output length (characters)
 MAX_OUTPUT_LENGTH = 10240
@@ -24,6 +27,11 @@ MAX_OUTPUT_LENGTH = 10240
 SHELL_TMP_DIR = Path("/tmp/shell/output")
 
 
+# Bytes kept in memory per output stream, enough for MAX_OUTPUT_LENGTH UTF-8 characters
+_STREAM_TAIL_BYTES = MAX_OUTPUT_LENGTH * 4
+_READ_CHUNK_SIZE = 64 * 1024
+
+
 @dataclass
 class ShellOutput:
     """Shell command execution output result."""
@@ -31,6 +39,60 @@ class ShellOutput:
     stdout: str
     stderr: str
     message: str | None = None
+    # Complete stream contents, spilled to disk when a stream outgrew the in-memory tail
+    stdout_spool: Path | None = None
+    stderr_spool: Path | None = None
+
+
+@dataclass
+class _StreamCapture:
+    """Keeps the tail of a process stream in memory and spools the full stream once it is too large."""
+    name: str
+    tail: bytearray = field(default_factory=bytearray)
+    spool_path: Path | None = None
+    spool: BinaryIO | None = None
+
+    def feed(self, chunk: bytes) -> None:
+        if self.spool is not None:
+            self.spool.write(chunk)
+        self.tail += chunk
+        if len(self.tail) <= 2 * _STREAM_TAIL_BYTES:
+            return
+        if self.spool is None:
+            # Nothing has been dropped yet, so the buffer still holds the whole stream
+            SHELL_TMP_DIR.mkdir(parents=True, exist_ok=True)
+            self.spool_path = SHELL_TMP_DIR / f"{uuid.uuid4().hex}.{self.name}.part"
+            self.spool = self.spool_path.open("wb")
+            self.spool.write(self.tail)
+        del self.tail[:-_STREAM_TAIL_BYTES]
+
+    def close(self) -> None:
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
+
+    def preview(self) -> str:
+        """Stripped and decoded end of the stream, read back from the spool if the tail is mostly whitespace."""
+        text = self.tail.strip().decode("utf-8", errors="replace")
+        if self.spool_path is None or len(text) >= MAX_OUTPUT_LENGTH:
+            return text
+        with self.spool_path.open("rb") as spool:
+            start, end = _stripped_bounds(spool)
+            begin = max(start, end - _STREAM_TAIL_BYTES)
+            spool.seek(begin)
+            return spool.read(end - begin).decode("utf-8", errors="replace")
+
+
+async def _capture_stream(stream: asyncio.StreamReader | None, capture: _StreamCapture) -> None:
+    """Read a process stream to EOF into a bounded capture."""
+    if stream is None:
+        return
+    while chunk := await stream.read(_READ_CHUNK_SIZE):
+        if capture.spool is None:
+            capture.feed(chunk)
+        else:
+            # Spool writes hit the disk, keep them off the event loop
+            await asyncio.to_thread(capture.feed, chunk)
 
 
 def _truncate_from_end(content: str, max_length: int = MAX_OUTPUT_LENGTH) -> tuple[str, bool]:
@@ -40,6 +102,55 @@ def _truncate_from_end(content: str, max_length: int = MAX_OUTPUT_LENGTH) -> tup
     return content[-max_length:], True
 
 
+def _stripped_bounds(spool: BinaryIO) -> tuple[int, int]:
+    """Byte range of a spool file left after stripping ASCII whitespace at both ends, like bytes.strip()."""
+    end = spool.seek(0, os.SEEK_END)
+    while end > 0:
+        begin = max(0, end - _READ_CHUNK_SIZE)
+        spool.seek(begin)
+        chunk = spool.read(end - begin)
+        stripped = chunk.rstrip()
+        end = begin + len(stripped)
+        if stripped:
+            break
+    start = 0
+    spool.seek(0)
+    while start < end:
+        chunk = spool.read(min(_READ_CHUNK_SIZE, end - start))
+        stripped = chunk.lstrip()
+        start += len(chunk) - len(stripped)
+        if stripped:
+            break
+    return start, end
+
+
+def _write_stream(f: TextIO, text: str, spool_path: Path | None) -> None:
+    """Write a stream's full content, copying from its spool file if it has one.
+
+    Spooled content is stripped and decoded the same way as the in-memory output.
+    """
+    if spool_path is None:
+        f.write(text)
+        return
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with spool_path.open("rb") as spool:
+        start, end = _stripped_bounds(spool)
+        spool.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = spool.read(min(_READ_CHUNK_SIZE, remaining))
+            remaining -= len(chunk)
+            f.write(decoder.decode(chunk))
+    f.write(decoder.decode(b"", final=True))
+
+
+def _remove_spools(output: ShellOutput) -> None:
+    """Delete the spool files of a shell output."""
+    for spool_path in (output.stdout_spool, output.stderr_spool):
+        if spool_path is not None:
+            spool_path.unlink(missing_ok=True)
+
+
 def _format_shell_output(
     cmd: str,
     output: ShellOutput,
@@ -50,6 +161,8 @@ def _format_shell_output(
     truncated_cmd, cmd_truncated = _truncate_from_end(cmd, cmd_max_length)
     truncated_stdout, stdout_truncated = _truncate_from_end(output.stdout)
     truncated_stderr, stderr_truncated = _truncate_from_end(output.stderr)
+    stdout_truncated = stdout_truncated or output.stdout_spool is not None
+    stderr_truncated = stderr_truncated or output.stderr_spool is not None
 
     # If truncated, save full output to file
     extra_message = ""
@@ -58,16 +171,14 @@ def _format_shell_output(
         unique_name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
         tmp_file = SHELL_TMP_DIR / f"{unique_name}_output.txt"
 
-        full_output = (
-            f"<cmd>{cmd}</cmd>\n"
-            f"<exit_code>{output.exit_code}</exit_code>\n"
-            f"<stdout>{output.stdout}</stdout>\n"
-            f"<stderr>{output.stderr}</stderr>\n"
-        )
-        if output.message:
-            full_output += f"<message>{output.message}</message>"
-
-        tmp_file.write_text(full_output, encoding="utf-8")
+        with tmp_file.open("w", encoding="utf-8") as f:
+            f.write(f"<cmd>{cmd}</cmd>\n<exit_code>{output.exit_code}</exit_code>\n<stdout>")
+            _write_stream(f, output.stdout, output.stdout_spool)
+            f.write("</stdout>\n<stderr>")
+            _write_stream(f, output.stderr, output.stderr_spool)
+            f.write("</stderr>\n")
+            if output.message:
+                f.write(f"<message>{output.message}</message>")
 
         extra_message = (
             f'\n\n⚠️ [Output truncated due to length, full output saved to: "{tmp_file}"]\n'
@@ -107,32 +218,57 @@ async def _execute_shell(
         env=merged_env,
     )
 
+    # Drain both pipes concurrently so neither can fill up and block the process
+    stdout_capture = _StreamCapture("stdout")
+    stderr_capture = _StreamCapture("stderr")
+    readers = [
+        asyncio.create_task(_capture_stream(process.stdout, stdout_capture)),
+        asyncio.create_task(_capture_stream(process.stderr, stderr_capture)),
+    ]
+
+    async def wait_for_exit() -> None:
+        await asyncio.wait(readers)
+        await process.wait()
+
     is_timeout = False
     try:
-        # Wait for process to complete
-        effective_timeout = timeout if timeout > 0 else None
-        stdout_bytes, stderr_bytes = await asyncio.wait_for(
-            process.communicate(),
-            timeout=effective_timeout,
-        )
-    except asyncio.TimeoutError:
-        is_timeout = True
-        # Try graceful termination
-        process.terminate()
         try:
-            await asyncio.wait_for(process.wait(), timeout=0.5)
+            # Wait for process to complete
+            effective_timeout = timeout if timeout > 0 else None
+            await asyncio.wait_for(wait_for_exit(), timeout=effective_timeout)
         except asyncio.TimeoutError:
-            # Force kill
-            process.kill()
-            await process.wait()
-
-        # Read existing output
-        stdout_bytes = await cast(asyncio.StreamReader, process.stdout).read() if process.stdout else b""
-        stderr_bytes = await cast(asyncio.StreamReader, process.stderr).read() if process.stderr else b""
-
-    # Decode output, use errors='replace' to handle non-UTF-8 characters
-    stdout = stdout_bytes.decode("utf-8", errors="replace").strip()
-    stderr = stderr_bytes.decode("utf-8", errors="replace").strip()
+            is_timeout = True
+            # Try graceful termination
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=0.5)
+            except asyncio.TimeoutError:
+                # Force kill
+                process.kill()
+                await process.wait()
+
+            # Read remaining output
+            await asyncio.wait(readers)
+
+        stdout_capture.close()
+        stderr_capture.close()
+        # Strip ASCII whitespace on the bytes, then decode once,
+        # using errors='replace' to handle non-UTF-8 characters
+        if stdout_capture.spool_path is None and stderr_capture.spool_path is None:
+            stdout, stderr = stdout_capture.preview(), stderr_capture.preview()
+        else:
+            stdout, stderr = await asyncio.to_thread(
+                lambda: (stdout_capture.preview(), stderr_capture.preview())
+            )
+    except BaseException:
+        # Cancelled or failed: stop reading and drop any spooled output
+        for reader in readers:
+            reader.cancel()
+        for capture in (stdout_capture, stderr_capture):
+            capture.close()
+            if capture.spool_path is not None:
+                capture.spool_path.unlink(missing_ok=True)
+        raise
 
     message = f"Execution exceeded {timeout}s, force terminated." if is_timeout else None
 
@@ -141,6 +277,8 @@ async def _execute_shell(
         stdout=stdout,
         stderr=stderr,
         message=message,
+        stdout_spool=stdout_capture.spool_path,
+        stderr_spool=stderr_capture.spool_path,
     )
 
 
@@ -151,8 +289,6 @@ async def shell(
     env: Annotated[str, "传入的环境变量 JSON 字符串，会与当前环境合并，格式如 '{\"KEY\": \"value\"}'"] = "",
 ):
     """使用 /bin/bash 执行一个 Shell 命令，支持 cwd、env、timeout 配置，返回 stdout、stderr 和 exit_code。"""
-    import json as json_module
-    
     # Handle default values
     if not cwd:
         cwd = os.path.expanduser("~")
@@ -161,15 +297,18 @@ async def shell(
     env_dict: dict[str, str] = {}
     if env:
         try:
-            env_dict = json_module.loads(env)
-        except json_module.JSONDecodeError:
+            env_dict = json_loads(env)
+        except json.JSONDecodeError:
             logger.warning(f"Failed to parse env parameter, using empty environment variables: {env}")
 
     # Execute command
     output = await _execute_shell(cmd, timeout, cwd, env_dict)
 
-    # Format output
-    formatted = _format_shell_output(cmd, output)
+    # Format output; copying spooled output can be large, so it runs in a worker thread
+    try:
+        formatted = await asyncio.to_thread(_format_shell_output, cmd, output)
+    finally:
+        _remove_spools(output)
     result = [
         {
             "type": ContentBlockType.TOOLRESULT.value,
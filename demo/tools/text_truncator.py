@@ -3,9 +3,33 @@
 提供统一的文本截断功能，优化为默认使用句子或段落边界截断策略。
 """
 
+import functools
 import re
+import string
 from dataclasses import dataclass
 
+# 句子结束标记：中英文句号、感叹号、问号、换行符
+_SENTENCE_END_CHARS = "。.！!？?\n"
+_MULTI_SPACE_RE = re.compile(r"[ \t]{2,}")
+_SEPARATOR_LINE_RE = re.compile(r"(-{3,}|={3,}|\*{3,})\n+")
+_LONG_IMAGE_LINK_RE = re.compile(r"!\[([^\]]*)\]\([^\)]{100,}\)")
+_LONG_URL_RE = re.compile(r"https?://[^\s\)]{100,}")
+
+
+@functools.lru_cache(maxsize=8)
+def _newline_run_re(max_consecutive_newlines: int) -> re.Pattern[str]:
+    """获取匹配超过指定数量连续换行符的正则（按参数缓存）"""
+    return re.compile(r"\n{" + str(max_consecutive_newlines + 1) + ",}")
+
+
+@functools.lru_cache(maxsize=8)
+def _format_fields(template: str) -> frozenset[str]:
+    """获取格式化模板中引用的字段名（按模板缓存）"""
+    return frozenset(
+        field_name for _, field_name, _, _ in string.Formatter().parse(template) if field_name
+    )
+
+
 DEFAULT_SUFFIX = " ... [Total Length {original_length}({original_lines} lines) > {max_length}, truncated to {truncated_length}({truncated_lines} lines)]"
 
 def truncate_text(
@@ -32,27 +56,28 @@ def truncate_text(
     truncated = text[:max_length]
 
     # 找到合适的截断点，默认策略：优先段落边界，其次句子边界
-    cutoff_point = -1
-
-    # 优先尝试段落边界
+    min_position = max_length * min_ratio
     para_boundary = truncated.rfind("\n\n")
-    if para_boundary > max_length * min_ratio:
+    use_paragraph = para_boundary > min_position
+    if use_paragraph:
         cutoff_point = para_boundary
     else:
         # 退回到句子边界
-        cutoff_point = _find_sentence_boundary(truncated, max_length * min_ratio)
+        cutoff_point = _find_sentence_boundary(truncated, min_position)
 
+    # 行数统计需要完整扫描文本，仅在后缀模板用到时才计算
+    suffix_fields = _format_fields(truncate_suffix)
     suffix = truncate_suffix.format(
         original_length=len(text),
         max_length=max_length,
         truncated_length=len(truncated),
-        original_lines=text.count("\n") + 1,
-        truncated_lines=truncated.count("\n") + 1,
+        original_lines=text.count("\n") + 1 if "original_lines" in suffix_fields else 0,
+        truncated_lines=truncated.count("\n") + 1 if "truncated_lines" in suffix_fields else 0,
     )
     # 如果找到了合适的截断点
     if cutoff_point > 0:
         # 对于段落边界，不需要包含换行符
-        if cutoff_point == truncated.rfind("\n\n"):
+        if use_paragraph:
             return text[:cutoff_point] + "\n\n" + suffix
         else:
             # 对于句子边界，包含句号等标点
@@ -65,7 +90,7 @@ def truncate_text(
 
 
 def _find_sentence_boundary(text: str, min_position: float) -> int:
-    """使用正则表达式查找句子边界
+    """查找最后一个句子边界
 
     Args:
         text: 文本
@@ -74,19 +99,9 @@ def _find_sentence_boundary(text: str, min_position: float) -> int:
     Returns:
         句子边界位置，如果没有找到返回 -1
     """
-    # 使用正则表达式查找各种句子结束标记
-    # 包括中英文句号、感叹号、问号、换行符
-    sentence_end_pattern = r"[。.！!？?\n]"
-
-    # 找到所有句子结束标记的位置
-    matches = list(re.finditer(sentence_end_pattern, text))
-
-    # 从后向前查找第一个满足最小位置要求的标记
-    for match in reversed(matches):
-        if match.start() >= min_position:
-            return match.start()
-
-    return -1
+    # 每种结束标记只从后向前查找一次，取最靠后的位置
+    boundary = max(text.rfind(ch) for ch in _SENTENCE_END_CHARS)
+    return boundary if boundary >= min_position else -1
 
 
 def clean_text_whitespace(text: str, max_consecutive_newlines: int = 3) -> str:
@@ -103,12 +118,11 @@ def clean_text_whitespace(text: str, max_consecutive_newlines: int = 3) -> str:
         return text
 
     # 移除多余的换行符
-    newline_pattern = r"\n{" + str(max_consecutive_newlines + 1) + ",}"
     replacement = "\n" * max_consecutive_newlines
-    text = re.sub(newline_pattern, replacement, text)
+    text = _newline_run_re(max_consecutive_newlines).sub(replacement, text)
 
     # 移除多余的空格和制表符（保留单个空格）
-    text = re.sub(r"[ \t]{2,}", " ", text)
+    text = _MULTI_SPACE_RE.sub(" ", text)
 
     return text.strip()
 
@@ -126,13 +140,13 @@ def clean_markdown_content(text: str) -> str:
         return text
 
     # 统一分隔线格式
-    text = re.sub(r"(-{3,}|={3,}|\*{3,})\n+", "---\n", text)
+    text = _SEPARATOR_LINE_RE.sub("---\n", text)
 
     # 清理图片链接中的过长URL（保留图片说明文字）
-    text = re.sub(r"!\[([^\]]*)\]\([^\)]{100,}\)", r"![📷 \1]", text)
+    text = _LONG_IMAGE_LINK_RE.sub(r"![📷 \1]", text)
 
     # 清理过长的纯URL链接
-    text = re.sub(r"https?://[^\s\)]{100,}", "[长链接已省略]", text)
+    text = _LONG_URL_RE.sub("[长链接已省略]", text)
 
     return text
 
@@ -143,6 +157,8 @@ class FormatResult:
     is_clean_text_whitespace: bool
     is_clean_markdown: bool
     is_truncated: bool
+    # 仅在发生截断时填充：原始内容的 UTF-8 编码，供调用方直接落盘，避免二次编码
+    raw_bytes: bytes | None = None
 
 
 def format_content(
@@ -160,8 +176,9 @@ def format_content(
         min_ratio: 最小保留比例
 
     Returns:
-        str: 格式化后的内容
+        FormatResult: 格式化结果，截断时 raw_bytes 为原始内容的 UTF-8 编码
     """
+    original = content
     result = FormatResult(
         content=content,
         is_clean_text_whitespace=False,
@@ -187,5 +204,7 @@ def format_content(
     )
     result.is_truncated = len(content) < len(result.content)
     result.content = content
+    if result.is_truncated:
+        result.raw_bytes = original.encode("utf-8")
 
     return result
@@ -21,19 +21,20 @@ Data structure:
 }
 """
 
+import contextlib
+import io
 import json
 import os
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Annotated, Any, Literal
+from typing import Annotated, Any, Callable, Literal
 
 from loguru import logger
 from pydantic import ConfigDict
 from typing_extensions import NotRequired, TypedDict
 
-from cortex.model.definition import ContentBlockType
-from demo.tools.utils import json_dumps
+from demo.tools.utils import json_dumps, json_dumps_bytes, json_loads, wrap_tool_result
 from cortex.tools.function_tool import FunctionTool
 
 # Todo data file path template (local /tmp directory)
@@ -56,6 +57,9 @@ PRIORITY_ICONS: dict[str, str] = {
     "critical": "🔴",
 }
 
+# Separator between the summary and the task list
+_SEPARATOR_LINE = "=" * 60 + "\n"
+
 # Special fields set (displayed first)
 SPECIAL_FIELDS: frozenset[str] = frozenset({
     # Main description fields
@@ -72,11 +76,20 @@ SPECIAL_FIELDS: frozenset[str] = frozenset({
     "tags", "labels", "categories", "type",
 })
 
+# Fields already shown in the title line
+_TITLE_FIELDS: frozenset[str] = frozenset({"task", "title", "name", "status", "priority"})
+
+# Special fields listed below the title
+_LISTED_SPECIAL_FIELDS: frozenset[str] = SPECIAL_FIELDS - _TITLE_FIELDS
+
 # Timestamp fields
 TIMESTAMP_FIELDS: frozenset[str] = frozenset({
     "created_at", "updated_at", "modified_at", "completed_at"
 })
 
+# Metadata filled in by TodoItem.__post_init__ (besides "step")
+_METADATA_FIELDS: frozenset[str] = frozenset({"created_at", "updated_at", "status", "priority"})
+
 
 def _ensure_todo_dir():
     """Ensure todo directory exists."""
@@ -107,7 +120,7 @@ UPDATE_TYPE = dict[str, TodoItemDict | None]
 UPDATE_HINT_TYPE = dict[str, TodoItemHint | TodoItemDict | None]
 
 
-@dataclass
+@dataclass(slots=True)
 class TodoItem:
     """Single Todo item."""
 
@@ -123,14 +136,24 @@ class TodoItem:
         self.data.setdefault("status", "pending")
         self.data.setdefault("priority", "medium")
 
-    def update(self, updates: dict[str, Any]) -> None:
-        """Update content."""
+    def update(self, updates: dict[str, Any], updated_at: str | None = None) -> None:
+        """Update content, stamping it with ``updated_at`` (defaults to now)."""
         self.data.update(updates)
-        self.data["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        self.data["updated_at"] = updated_at or datetime.now().isoformat(timespec="seconds")
         self.data["step"] = self.step_id  # Keep step consistent
 
+    @classmethod
+    def _from_loaded(cls, step_id: str, data: dict[str, Any]) -> "TodoItem":
+        """Wrap previously saved data, skipping metadata defaults it already has."""
+        if data.get("step") != step_id or not _METADATA_FIELDS.issubset(data.keys()):
+            return cls(step_id, data)
+        item = cls.__new__(cls)
+        item.step_id = step_id
+        item.data = data
+        return item
 
-@dataclass
+
+@dataclass(slots=True)
 class TodoCollection:
     """Todo collection."""
 
@@ -138,13 +161,18 @@ class TodoCollection:
 
     def merge_updates(self, updates: UPDATE_TYPE) -> None:
         """Merge updates."""
+        items = self.items
+        now = datetime.now().isoformat(timespec="seconds")
         for step_id, step_updates in updates.items():
             if step_updates is None:
-                self.items.pop(step_id, None)
-            elif step_id in self.items:
-                self.items[step_id].update(step_updates)
+                items.pop(step_id, None)
+                continue
+            item = items.get(step_id)
+            if item is None:
+                items[step_id] = TodoItem(step_id, dict(step_updates))
             else:
-                self.items[step_id] = TodoItem(step_id, dict(step_updates))
+                # One timestamp for the whole batch
+                item.update(step_updates, updated_at=now)
 
     def to_dict(self) -> dict[str, dict[str, Any]]:
         """Convert to dictionary format."""
@@ -155,7 +183,7 @@ class TodoCollection:
         """Create from dictionary."""
         collection = cls()
         for step_id, todo_data in data.items():
-            collection.items[step_id] = TodoItem(step_id, todo_data)
+            collection.items[step_id] = TodoItem._from_loaded(step_id, todo_data)
         return collection
 
 
@@ -166,15 +194,17 @@ def format_todo_result(todos: TodoCollection) -> tuple[str, dict[str, Any]]:
     # Single pass to calculate statistics
     stats: dict[str, int] = {"total": len(todos.items), "pending": 0, "in_progress": 0, "completed": 0, "blocked": 0}
     for item in todos.items.values():
-        status = item.data.get("status", "pending")
+        status = item.data["status"]
         if status in stats:
             stats[status] += 1
 
     # Build formatted text
-    lines = ["<todo_result>"]
+    buf = io.StringIO()
+    write = buf.write
+    write("<todo_result>\n")
 
     # Show summary (compatible with tests)
-    lines.append(f"📊 Total: {stats['total']} tasks")
+    write(f"📊 Total: {stats['total']} tasks\n")
 
     # If there are status statistics, show details
     status_parts = [
@@ -183,78 +213,96 @@ def format_todo_result(todos: TodoCollection) -> tuple[str, dict[str, Any]]:
         if stats[s] > 0
     ]
     if status_parts:
-        lines.append(f"Status: {' | '.join(status_parts)}")
+        write(f"Status: {' | '.join(status_parts)}\n")
 
-    lines.append("=" * 60)
+    write(_SEPARATOR_LINE)
 
     # Format each task
+    status_icon_of = STATUS_ICONS.get
+    priority_icon_of = PRIORITY_ICONS.get
     for step_id, item in todos.items.items():
         todo = item.data
-        # Get status and priority icons
-        status = todo.get("status", "pending")
-        priority = todo.get("priority", "medium")
-        status_icon = STATUS_ICONS.get(status, "📌")
-        priority_icon = PRIORITY_ICONS.get(priority, "")
+        # Get status and priority icons (TodoItem guarantees both keys)
+        status = todo["status"]
+        priority = todo["priority"]
+        status_icon = status_icon_of(status, "📌")
+        priority_icon = priority_icon_of(priority, "")
 
         # Show step title
         task_title = todo.get("task") or todo.get("title") or todo.get("name") or f"Step {step_id}"
-        lines.append(f"\n{status_icon} Step {step_id}: {task_title} {priority_icon}".strip())
-
-        # Fields already shown in title
-        displayed_fields: set[str] = {"task", "title", "name", "status", "priority"}
+        write(f"\n{status_icon} Step {step_id}: {task_title} {priority_icon}".strip())
+        write("\n")
 
         # 1. Show special fields first (maintain insertion order)
-        for f, value in todo.items():
-            if f not in SPECIAL_FIELDS or f in displayed_fields:
-                continue
-            displayed_fields.add(f)
-            _append_field_line(lines, f, value)
+        special_fields = _LISTED_SPECIAL_FIELDS.intersection(todo)
+        if special_fields:
+            for f, value in todo.items():
+                if f in special_fields:
+                    _append_field_line(write, f, value)
+        displayed_fields: set[str] = {*_TITLE_FIELDS, *special_fields}
 
         # 2. Show timestamp fields
         for f in TIMESTAMP_FIELDS:
             if f in todo and f not in displayed_fields:
-                lines.append(f"  {f}: {todo[f]}")
+                write(f"  {f}: {todo[f]}\n")
                 displayed_fields.add(f)
 
         # 3. Remaining fields as JSON
         displayed_fields.add("step")  # step field doesn't need to be shown again
-        other_fields = {k: v for k, v in todo.items() if k not in displayed_fields}
-
-        if other_fields:
-            lines.append("  --- other fields ---")
+        # Usually every field has been shown already; check that before building a dict
+        if not displayed_fields.issuperset(todo):
+            other_fields = {k: v for k, v in todo.items() if k not in displayed_fields}
+            write("  --- other fields ---\n")
             json_str = json_dumps(other_fields, ensure_ascii=False, indent=4)
             # Add indentation
-            indented = "\n".join(f"  {line}" for line in json_str.split("\n"))
-            lines.append(indented)
+            indented = json_str.replace("\n", "\n  ")
+            write(f"  {indented}\n")
 
-    lines.append("</todo_result>")
+    write("</todo_result>")
 
     # Build structured data to return
-    return "\n".join(lines), {"todos": todos_dict, "stats": stats}
-
-
-def _append_field_line(lines: list[str], field_name: str, value: Any) -> None:
-    """Format and append field line."""
-    if field_name == "details":
-        lines.append(f"  📝 {value}")
-    elif field_name == "dependencies":
-        if isinstance(value, list) and value:
-            deps_str = ", ".join(str(d) for d in value)
-            lines.append(f"  🔗 Depends on: [{deps_str}]")
-    elif field_name == "tags":
-        if isinstance(value, list) and value:
-            tags_str = ", ".join(f"#{tag}" for tag in value)
-            lines.append(f"  🏷️  {tags_str}")
+    return buf.getvalue(), {"todos": todos_dict, "stats": stats}
+
+
+def _write_details(write: Callable[[str], Any], value: Any) -> None:
+    write(f"  📝 {value}\n")
+
+
+def _write_dependencies(write: Callable[[str], Any], value: Any) -> None:
+    if isinstance(value, list) and value:
+        deps_str = ", ".join(str(d) for d in value)
+        write(f"  🔗 Depends on: [{deps_str}]\n")
+
+
+def _write_tags(write: Callable[[str], Any], value: Any) -> None:
+    if isinstance(value, list) and value:
+        tags_str = ", ".join(f"#{tag}" for tag in value)
+        write(f"  🏷️  {tags_str}\n")
+
+
+# Fields with a dedicated display format
+_FIELD_HANDLERS: dict[str, Callable[[Callable[[str], Any], Any], None]] = {
+    "details": _write_details,
+    "dependencies": _write_dependencies,
+    "tags": _write_tags,
+}
+
+
+def _append_field_line(write: Callable[[str], Any], field_name: str, value: Any) -> None:
+    """Format and write field line."""
+    handler = _FIELD_HANDLERS.get(field_name)
+    if handler is not None:
+        handler(write, value)
     elif isinstance(value, (str, int, float, bool)):
-        lines.append(f"  {field_name}: {value}")
+        write(f"  {field_name}: {value}\n")
     else:
         # Complex types use JSON
         json_compact = json.dumps(value, ensure_ascii=False)
         if len(json_compact) > 80:
             json_str = json.dumps(value, ensure_ascii=False, indent=2)
-            lines.append(f"  {field_name}: {json_str}")
+            write(f"  {field_name}: {json_str}\n")
         else:
-            lines.append(f"  {field_name}: {json_compact}")
+            write(f"  {field_name}: {json_compact}\n")
 
 
 def seems_like_complete_rewrite(updates: UPDATE_TYPE, current: dict[str, Any]) -> bool:
@@ -262,11 +310,16 @@ def seems_like_complete_rewrite(updates: UPDATE_TYPE, current: dict[str, Any]) -
     if not current:
         return True
 
-    non_null = {k: v for k, v in updates.items() if v is not None}
-    new_keys = set(non_null.keys()) - set(current.keys())
-    return len(new_keys) > len(current) * 0.8 and not (
-            set(non_null.keys()) & set(current.keys())
-    )
+    # Any non-null update to an existing step means an incremental update;
+    # otherwise every non-null key is new
+    new_count = 0
+    for step_id, step_updates in updates.items():
+        if step_updates is None:
+            continue
+        if step_id in current:
+            return False
+        new_count += 1
+    return new_count > len(current) * 0.8
 
 
 def create_todo_tool(context_id: str = "default"):
@@ -284,11 +337,30 @@ def create_todo_tool(context_id: str = "default"):
     # Use context_id as session_id
     todo_file_path = TODO_FILE_TEMPLATE.format(context_id)
 
+    # Formatted output for the last seen todo file state, keyed by (st_mtime_ns, st_size)
+    read_cache: dict[str, Any] = {"key": None, "text": None}
+
+    def todo_file_key() -> tuple[int, int] | None:
+        """Return a cheap change marker for the todo file, or None if it does not exist."""
+        try:
+            st = os.stat(todo_file_path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    # Bytes last read from or written to the todo file, with the stat key they
+    # correspond to; a save producing the same bytes for an unchanged file is skipped
+    disk_state: dict[str, Any] = {"data": None, "key": None}
+
     def load_todos() -> dict[str, dict[str, Any]]:
         """Load todo data from local file system."""
         try:
-            with open(todo_file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(todo_file_path, "rb") as f:
+                raw = f.read()
+                st = os.fstat(f.fileno())
+            disk_state["data"] = raw
+            disk_state["key"] = (st.st_mtime_ns, st.st_size)
+            return json_loads(raw)
         except FileNotFoundError:
             logger.debug(f"Todo file {todo_file_path} does not exist, returning empty dict")
         except Exception as e:
@@ -298,9 +370,22 @@ def create_todo_tool(context_id: str = "default"):
     def save_todos(todos: dict[str, dict[str, Any]]) -> None:
         """Save todo data to local file system."""
         try:
+            payload = json_dumps_bytes(todos, indent=2)
+            if payload == disk_state["data"] and todo_file_key() == disk_state["key"]:
+                return
             _ensure_todo_dir()
-            with open(todo_file_path, "w", encoding="utf-8") as f:
-                json.dump(todos, f, ensure_ascii=False, indent=2)
+            # Write a sibling file and rename it over the target, so readers never see a partial file
+            tmp_path = f"{todo_file_path}.tmp.{os.getpid()}"
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, todo_file_path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+                raise
+            disk_state["data"] = payload
+            disk_state["key"] = todo_file_key()
         except Exception as e:
             logger.error(f"Failed to save todo file: {e}")
             raise
@@ -345,50 +430,48 @@ def create_todo_tool(context_id: str = "default"):
         # Use empty dict if updates is None
         updates_dict: UPDATE_TYPE = updates if updates else {}
 
-        # Load current todo from local (dictionary format)
-        current_todos_dict = load_todos()
-
-        # Convert to TodoCollection
-        current_collection = TodoCollection.from_dict(current_todos_dict)
-
-        # Decide operation based on updates_dict
-        if not updates_dict:
-            # Empty dict = read only
-            result_collection = current_collection
-            operation = "read"
-        elif seems_like_complete_rewrite(updates_dict, current_todos_dict):
-            # Complete rewrite
-            result_collection = TodoCollection()
-            result_collection.merge_updates(updates_dict)
-            operation = "rewrite"
+        # A read-only call on an unchanged file reuses the previous output
+        file_key = todo_file_key() if not updates_dict else None
+        if file_key is not None and file_key == read_cache["key"]:
+            formatted_text = read_cache["text"]
         else:
-            # Incremental update
-            result_collection = TodoCollection.from_dict(current_todos_dict)
-            result_collection.merge_updates(updates_dict)
-            operation = "update"
-
-        # Save to local (only save when there are updates)
-        if operation != "read":
-            # Convert back to dictionary format for saving
-            save_todos(result_collection.to_dict())
-
-        # Format result
-        formatted_text, structured_data = format_todo_result(result_collection)
-
-        # Add operation info to structured data
-        structured_data["operation"] = operation
-        result = [
-            {
-                "type": ContentBlockType.TOOLRESULT.value,
-                "content": [
-                    {
-                        "type": ContentBlockType.TEXT.value,
-                        ContentBlockType.TEXT.value: formatted_text,
-                    }
-                ]
-            }
-        ]
-        return result
+            # Load current todo from local (dictionary format)
+            current_todos_dict = load_todos()
+
+            # Decide operation based on updates_dict; the collection is built only where it is used
+            if not updates_dict:
+                # Empty dict = read only
+                result_collection = TodoCollection.from_dict(current_todos_dict)
+                operation = "read"
+            elif seems_like_complete_rewrite(updates_dict, current_todos_dict):
+                # Complete rewrite
+                result_collection = TodoCollection()
+                result_collection.merge_updates(updates_dict)
+                operation = "rewrite"
+            else:
+                # Incremental update
+                result_collection = TodoCollection.from_dict(current_todos_dict)
+                result_collection.merge_updates(updates_dict)
+                operation = "update"
+
+            # Save to local (only save when there are updates)
+            if operation != "read":
+                # Convert back to dictionary format for saving
+                save_todos(result_collection.to_dict())
+
+            # Format result
+            formatted_text, structured_data = format_todo_result(result_collection)
+
+            # Add operation info to structured data
+            structured_data["operation"] = operation
+
+            # Remember the output for the file state it describes
+            if operation != "read":
+                file_key = todo_file_key()
+            read_cache["key"] = file_key
+            read_cache["text"] = formatted_text
+
+        return wrap_tool_result(formatted_text)
 
     function_tool = FunctionTool(
         name="todo",
@@ -3,10 +3,114 @@ Utility functions for demo tools.
 """
 
 import json
-from typing import Any
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable
 
+import aiohttp
 from pydantic import BaseModel
 
+from cortex.model.definition import ContentBlockType
+
+try:
+    import orjson
+except Exception:  # noqa: BLE001
+    orjson = None
+
+# Content block type strings, resolved once
+_TOOLRESULT = ContentBlockType.TOOLRESULT.value
+_TEXT = ContentBlockType.TEXT.value
+
+# Session installed by http_session_scope() for the current context
+_scoped_http_session: ContextVar[aiohttp.ClientSession | None] = ContextVar(
+    "_scoped_http_session", default=None
+)
+
+
+def _new_http_session() -> aiohttp.ClientSession:
+    # Pooled connector with DNS caching so repeated calls reuse TCP/TLS connections
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=20,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+        )
+    )
+
+
+@asynccontextmanager
+async def http_session_scope() -> AsyncIterator[aiohttp.ClientSession]:
+    """
+    Share one pooled aiohttp session between the web tools inside this block.
+
+    Entrypoints wrap their whole run in it; the session is closed on exit, while
+    its event loop is still running. Tasks started inside the block inherit it.
+    """
+    session = _new_http_session()
+    token = _scoped_http_session.set(session)
+    try:
+        yield session
+    finally:
+        _scoped_http_session.reset(token)
+        await session.close()
+
+
+@asynccontextmanager
+async def http_session() -> AsyncIterator[aiohttp.ClientSession]:
+    """
+    Yield the session of the enclosing http_session_scope().
+
+    Outside of a scope a private session is created and closed on exit, so
+    callers never leave a session open.
+    """
+    session = _scoped_http_session.get()
+    if session is not None and not session.closed:
+        yield session
+        return
+    async with _new_http_session() as session:
+        yield session
+
+
+def json_loads(data: str | bytes) -> Any:
+    """
+    Parse a JSON document, using orjson when it is installed.
+
+    Both backends raise a json.JSONDecodeError subclass on invalid input.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Encoders for types json cannot serialize natively. Looked up by exact type;
+# subclasses are resolved through the MRO once and then cached here.
+_JSON_ENCODERS: dict[type, Callable[[Any], Any]] = {
+    BaseModel: lambda obj: obj.model_dump(),
+}
+
+# orjson serializes datetimes and dataclasses itself; pass them to _json_default
+# instead, which rejects them as the stdlib does
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+
+
+def _json_default(obj: Any) -> Any:
+    cls = type(obj)
+    encoder = _JSON_ENCODERS.get(cls)
+    if encoder is None:
+        for base in cls.__mro__[1:]:
+            encoder = _JSON_ENCODERS.get(base)
+            if encoder is not None:
+                _JSON_ENCODERS[cls] = encoder
+                break
+        else:
+            raise TypeError(f"Object of type {cls.__name__} is not JSON serializable")
+    return encoder(obj)
+
 
 def json_dumps(data: Any, indent: int = 2, ensure_ascii: bool = False) -> str:
     """
@@ -15,6 +119,10 @@ def json_dumps(data: Any, indent: int = 2, ensure_ascii: bool = False) -> str:
     This is a thin wrapper around json.dumps that adds automatic serialization
     for Pydantic BaseModel instances. When encountering a Pydantic model, it
     calls model_dump() to convert it to a dict before JSON serialization.
+
+    When orjson is installed, the common ``indent`` of 2 (or None) with
+    ``ensure_ascii=False`` is serialized by orjson; other settings, and data
+    orjson rejects, fall back to the standard library.
     
     Args:
         data: The data to serialize. Can be any JSON-serializable type,
@@ -36,9 +144,34 @@ def json_dumps(data: Any, indent: int = 2, ensure_ascii: bool = False) -> str:
         >>> json_dumps({"user": User(name="Alice", age=30)})
         '{\\n  "user": {\\n    "name": "Alice",\\n    "age": 30\\n  }\\n}'
     """
-    def default(obj: Any) -> Any:
-        if isinstance(obj, BaseModel):
-            return obj.model_dump()
-        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
-    
-    return json.dumps(data, indent=indent, ensure_ascii=ensure_ascii, default=default)
+    if orjson is not None and indent in (None, 2) and not ensure_ascii:
+        option = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTIONS
+        try:
+            return orjson.dumps(data, default=_json_default, option=option).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits; let the stdlib serialize or report it
+            pass
+
+    return json.dumps(data, indent=indent, ensure_ascii=ensure_ascii, default=_json_default)
+
+
+def json_dumps_bytes(data: Any, indent: int | None = 2) -> bytes:
+    """
+    Serialize data to UTF-8 encoded JSON bytes, ready to be written to a binary file.
+
+    Same output as ``json_dumps(data, indent=indent).encode("utf-8")``, but the
+    orjson path returns its bytes directly instead of round-tripping through str.
+    """
+    if orjson is not None and indent in (None, 2):
+        option = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTIONS
+        try:
+            return orjson.dumps(data, default=_json_default, option=option)
+        except orjson.JSONEncodeError:
+            pass
+
+    return json.dumps(data, indent=indent, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+def wrap_tool_result(text: str) -> list[dict]:
+    """Wrap formatted text as a tool result content block."""
+    return [{"type": _TOOLRESULT, "content": [{"type": _TEXT, _TEXT: text}]}]
@@ -22,10 +22,11 @@ import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Mapping, Sequence
+from typing import Any, Callable, Mapping, Sequence
 
 import megfile
 import yaml
+from pydantic import TypeAdapter
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 
@@ -35,12 +36,23 @@ from cortex.model.definition import ChatMessage, ChatToolCall
 from cortex.orchestrator.orchestrator import Orchestrator, OrchMode
 from cortex.orchestrator.types import AgentEvent, AgentEventType, AgentRequest
 from demo.dr_agent.dr_agent import get_dr_agent_config, make_dr_agent
+from demo.tools.utils import (
+    http_session_scope,
+    json_dumps_bytes,
+    json_loads,
+)
 from scripts.configs.prompt import SYSTEM_PROMPT
 
 logger = logging.getLogger(__name__)
 
+# libyaml-backed safe loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-@dataclass
+# Serializes a whole message list in one pydantic-core call
+_MESSAGES_ADAPTER = TypeAdapter(list[ChatMessage])
+
+
+@dataclass(slots=True)
 class EvalTask:
     """Simple container describing a single evaluation task."""
 
@@ -48,7 +60,14 @@ class EvalTask:
     prompt: str
 
 
+# How run_single_task records events: the compact formatted view, the full
+# pydantic dump of each event, or only the event count
+TRACE_FORMATS = ("formatted", "raw", "off")
+
 SLUG_REGEX = re.compile(r"[^a-zA-Z0-9_-]+")
+ANSWER_REGEX = re.compile(r"<answer>(.*?)</answer>", re.DOTALL | re.IGNORECASE)
+THINK_REGEX = re.compile(r"<think>.*?</think>", re.DOTALL | re.IGNORECASE)
+_TRUNCATED_SUFFIX = "... (truncated, %d chars)"
 
 
 def slugify(value: str | None, fallback_prefix: str = "task") -> str:
@@ -63,72 +82,105 @@ def slugify(value: str | None, fallback_prefix: str = "task") -> str:
 
 
 def _truncate(text: str, limit: int | None = 600) -> str:
-    if limit is None:
-        return text
-    if len(text) <= limit:
+    length = len(text)
+    if limit is None or length <= limit:
         return text
-    return f"{text[:limit]}... (truncated, {len(text)} chars)"
+    return text[:limit] + _TRUNCATED_SUFFIX % length
+
+
+def _stringify_blocks(content: list[Any]) -> str:
+    parts: list[str] = []
+    for block in content:
+        if isinstance(block, dict):
+            text_value = block.get("text")
+            if not text_value:
+                text_value = block.get("content")
+            if isinstance(text_value, str):
+                parts.append(text_value)
+                continue
+
+            data_value = block.get("data")
+            if isinstance(data_value, dict):
+                nested_text = data_value.get("text")
+                if not nested_text:
+                    nested_text = data_value.get("content")
+                if isinstance(nested_text, str):
+                    parts.append(nested_text)
+                    continue
+                nested_thinking = data_value.get("thinking")
+                if isinstance(nested_thinking, str):
+                    continue
+        else:
+            parts.append(str(block))
+    return "\n".join(parts) if parts else json.dumps(content, ensure_ascii=False)
 
 
-def _stringify_content(content: Any) -> str:
-    if content is None:
-        return ""
+def _stringify_other(content: Any) -> str:
+    # str/list subclasses miss the exact-type lookup but keep their usual handling
     if isinstance(content, str):
         return content
     if isinstance(content, list):
-        parts: list[str] = []
-        for block in content:
-            if isinstance(block, dict):
-                text_value = block.get("text") or block.get("content")
-                if isinstance(text_value, str):
-                    parts.append(text_value)
-                    continue
+        return _stringify_blocks(content)
+    return json.dumps(content, ensure_ascii=False)
+
 
-                data_value = block.get("data")
-                if isinstance(data_value, dict):
-                    nested_text = data_value.get("text") or data_value.get("content")
-                    if isinstance(nested_text, str):
-                        parts.append(nested_text)
-                        continue
-                    nested_thinking = data_value.get("thinking")
-                    if isinstance(nested_thinking, str):
-                        continue
+_STRINGIFY_DISPATCH: dict[type, Callable[[Any], str]] = {
+    str: str.__str__,
+    list: _stringify_blocks,
+    type(None): lambda content: "",
+}
+
+
+def _stringify_content(content: Any) -> str:
+    return _STRINGIFY_DISPATCH.get(type(content), _stringify_other)(content)
+
+
+def _format_blocks(content: list[Any], max_block_chars: int | None) -> list[dict[str, Any]]:
+    formatted: list[dict[str, Any]] = []
+    for block in content:
+        if isinstance(block, dict):
+            entry: dict[str, Any] = {}
+            if "type" in block:
+                entry["type"] = block["type"]
+            text_value = block.get("text")
+            if not text_value:
+                text_value = block.get("content")
+            if isinstance(text_value, str):
+                entry["text"] = (
+                    text_value if max_block_chars is None else _truncate(text_value, max_block_chars)
+                )
+            elif text_value is not None:
+                entry["data"] = text_value
             else:
-                parts.append(str(block))
-        return "\n".join(parts) if parts else json.dumps(content, ensure_ascii=False)
-    return json.dumps(content, ensure_ascii=False)
+                entry["data"] = block
+            formatted.append(entry)
+        else:
+            formatted.append({"data": block})
+    return formatted
 
 
-def _format_content_blocks(
-    content: Any, max_block_chars: int | None = 800
-) -> Any:
-    if content is None:
-        return None
+def _format_other(content: Any, max_block_chars: int | None) -> Any:
     if isinstance(content, str):
         return _truncate(content, max_block_chars)
     if isinstance(content, list):
-        formatted: list[dict[str, Any]] = []
-        for block in content:
-            if isinstance(block, dict):
-                entry: dict[str, Any] = {}
-                if "type" in block:
-                    entry["type"] = block["type"]
-                text_value = block.get("text") or block.get("content")
-                if isinstance(text_value, str):
-                    entry["text"] = (
-                        text_value if max_block_chars is None else _truncate(text_value, max_block_chars)
-                    )
-                elif text_value is not None:
-                    entry["data"] = text_value
-                else:
-                    entry["data"] = block
-                formatted.append(entry)
-            else:
-                formatted.append({"data": block})
-        return formatted
+        return _format_blocks(content, max_block_chars)
     return content
 
 
+# Exact-type handlers for message content; anything else goes through _format_other
+_FORMAT_DISPATCH: dict[type, Callable[[Any, int | None], Any]] = {
+    str: _truncate,
+    list: _format_blocks,
+    type(None): lambda content, max_block_chars: None,
+}
+
+
+def _format_content_blocks(
+    content: Any, max_block_chars: int | None = 800
+) -> Any:
+    return _FORMAT_DISPATCH.get(type(content), _format_other)(content, max_block_chars)
+
+
 def _format_tool_calls(tool_calls: list[ChatToolCall] | None) -> list[dict[str, Any]] | None:
     if not tool_calls:
         return None
@@ -149,10 +201,10 @@ def _extract_answer_text(content: Any) -> str | None:
     text = _stringify_content(content)
     if not text:
         return None
-    answer_match = re.search(r"<answer>(.*?)</answer>", text, flags=re.DOTALL | re.IGNORECASE)
+    answer_match = ANSWER_REGEX.search(text)
     if answer_match:
         return answer_match.group(1).strip()
-    cleaned = re.sub(r"<think>.*?</think>", "", text, flags=re.DOTALL | re.IGNORECASE).strip()
+    cleaned = THINK_REGEX.sub("", text).strip()
     return cleaned or text
 
 
@@ -177,6 +229,69 @@ def _format_message(
     return data
 
 
+def _format_response_event(
+    event: AgentEvent, formatted: dict[str, Any], max_block_chars: int | None
+) -> None:
+    response = event.response
+    if not response:
+        return
+    formatted["status"] = response.status.value
+    formatted["message_type"] = response.message_type.value
+    if response.metadata:
+        formatted["step_metadata"] = response.metadata
+    if response.error_msg is not None:
+        formatted["error"] = response.error_msg
+    message = _format_message(response.message, max_block_chars=max_block_chars)
+    if message:
+        formatted["message"] = message
+
+
+def _format_tool_call_event(
+    event: AgentEvent, formatted: dict[str, Any], max_block_chars: int | None
+) -> None:
+    call = event.client_tool_call
+    if not call:
+        return
+    formatted["tool_call"] = {
+        "tool_call_id": call.tool_call_id,
+        "type": call.type.value,
+        "function": {
+            "name": call.function.name,
+            "arguments": call.function.arguments,
+        },
+        "extra": call.extra,
+    }
+
+
+def _format_tool_result_event(
+    event: AgentEvent, formatted: dict[str, Any], max_block_chars: int | None
+) -> None:
+    if not event.client_tool_result:
+        return
+    formatted["tool_result"] = {
+        "status": event.client_tool_result.status.value,
+        "message": _format_message(
+            event.client_tool_result.message, max_block_chars=max_block_chars
+        ),
+    }
+
+
+def _format_error_event(
+    event: AgentEvent, formatted: dict[str, Any], max_block_chars: int | None
+) -> None:
+    if event.error:
+        formatted["error"] = event.error
+
+
+# Per-type formatters that add the type-specific fields to a formatted event
+_EVENT_FORMATTERS: dict[AgentEventType, Callable[[AgentEvent, dict[str, Any], int | None], None]] = {
+    AgentEventType.RESPONSE: _format_response_event,
+    AgentEventType.CLIENT_TOOL_CALL: _format_tool_call_event,
+    AgentEventType.CLIENT_TOOL_RESULT: _format_tool_result_event,
+    AgentEventType.ERROR: _format_error_event,
+}
+
+
 def _format_event(event: AgentEvent, index: int, max_block_chars: int | None = 800) -> dict[str, Any]:
     formatted: dict[str, Any] = {
         "index": index,
@@ -187,37 +302,9 @@ def _format_event(event: AgentEvent, index: int, max_block_chars: int | None = 8
     if event.metadata:
         formatted["metadata"] = event.metadata
 
-    if event.type == AgentEventType.RESPONSE and event.response:
-        response = event.response
-        formatted["status"] = response.status.value
-        formatted["message_type"] = response.message_type.value
-        if response.metadata:
-            formatted["step_metadata"] = response.metadata
-        if response.error_msg is not None:
-            formatted["error"] = response.error_msg
-        message = _format_message(response.message, max_block_chars=max_block_chars)
-        if message:
-            formatted["message"] = message
-    elif event.type == AgentEventType.CLIENT_TOOL_CALL and event.client_tool_call:
-        call = event.client_tool_call
-        formatted["tool_call"] = {
-            "tool_call_id": call.tool_call_id,
-            "type": call.type.value,
-            "function": {
-                "name": call.function.name,
-                "arguments": call.function.arguments,
-            },
-            "extra": call.extra,
-        }
-    elif event.type == AgentEventType.CLIENT_TOOL_RESULT and event.client_tool_result:
-        formatted["tool_result"] = {
-            "status": event.client_tool_result.status.value,
-            "message": _format_message(
-                event.client_tool_result.message, max_block_chars=max_block_chars
-            ),
-        }
-    elif event.type == AgentEventType.ERROR and event.error:
-        formatted["error"] = event.error
+    formatter = _EVENT_FORMATTERS.get(event.type)
+    if formatter is not None:
+        formatter(event, formatted, max_block_chars)
     return formatted
 
 
@@ -229,8 +316,7 @@ def load_tasks_from_file(path: Path) -> list[EvalTask]:
       2. List of objects with "prompt"/"task" keys (and optional "id")
       3. Object with a "tasks" field following format 1 or 2
     """
-    with path.open("r", encoding="utf-8") as f:
-        raw_payload = json.load(f)
+    raw_payload = json_loads(path.read_bytes())
 
     if isinstance(raw_payload, dict) and "tasks" in raw_payload:
         payload = raw_payload["tasks"]
@@ -287,13 +373,18 @@ def merge_tasks(
         raise ValueError("No tasks provided. Use --task or --tasks-file.")
 
     # Normalize IDs to be filesystem-safe and unique
-    seen: dict[str, int] = {}
+    used_ids: set[str] = set()
+    next_suffix: dict[str, int] = {}
     for task in tasks:
         safe_id = slugify(task.id)
-        counter = seen.get(safe_id, 0)
-        if counter > 0:
-            safe_id = f"{safe_id}_{counter+1}"
-        seen[safe_id] = counter + 1
+        if safe_id in used_ids:
+            # Number repeats from _2, skipping suffixes that are already taken
+            suffix = next_suffix.get(safe_id, 2)
+            while f"{safe_id}_{suffix}" in used_ids:
+                suffix += 1
+            next_suffix[safe_id] = suffix + 1
+            safe_id = f"{safe_id}_{suffix}"
+        used_ids.add(safe_id)
         task.id = safe_id
     return tasks
 
@@ -316,16 +407,14 @@ def build_agent_config(
     context_lower_limit: int | None = None,
 ) -> AgentConfig:
     """Create an AgentConfig for running standalone tasks."""
-    config = get_dr_agent_config()
-    config = config.model_copy(deep=True)
-    model_params = config.model.model_copy(deep=True)
-    infer_kwargs = dict(model_params.infer_kwargs or {})
+    # One deep copy owns all nested params and dicts, so they are updated in place
+    config = get_dr_agent_config().model_copy(deep=True)
+    infer_kwargs = config.model.infer_kwargs or {}
     infer_kwargs["stream"] = streaming
     if request_timeout is not None:
         infer_kwargs["request_timeout"] = request_timeout
-    model_params.infer_kwargs = infer_kwargs
-    config.model = model_params
-    extra_cfg = dict(config.extra_config or {})
+    config.model.infer_kwargs = infer_kwargs
+    extra_cfg = config.extra_config or {}
     if context_upper_limit is not None:
         extra_cfg["final_answer_context_upper_limit"] = int(context_upper_limit)
     if context_lower_limit is not None:
@@ -334,6 +423,50 @@ def build_agent_config(
     return config
 
 
+def build_system_prompt() -> str:
+    """Render SYSTEM_PROMPT for the current UTC date."""
+    current_date = datetime.now(tz=timezone.utc).date().isoformat()
+    return SYSTEM_PROMPT.replace("__CURRENT_DATE__", current_date)
+
+
+# Event lines buffered in memory before they are handed to a writer thread
+_EVENTS_FLUSH_LINES = 64
+
+
+class _EventSink:
+    """NDJSON event file (local or s3) whose blocking I/O runs in worker threads.
+
+    Lines are buffered and written in batches so that concurrent tasks do not
+    stall the event loop on every event.
+    """
+
+    def __init__(self, handle: Any):
+        self._handle = handle
+        self._pending: list[bytes] = []
+
+    @classmethod
+    async def open(cls, path: str | Path) -> _EventSink:
+        return cls(await asyncio.to_thread(megfile.smart_open, str(path), "wb"))
+
+    async def write(self, event: dict[str, Any]) -> None:
+        self._pending.append(json_dumps_bytes(event, indent=None) + b"\n")
+        if len(self._pending) >= _EVENTS_FLUSH_LINES:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        data = b"".join(self._pending)
+        self._pending.clear()
+        await asyncio.to_thread(self._handle.write, data)
+
+    async def close(self) -> None:
+        try:
+            await self.flush()
+        finally:
+            await asyncio.to_thread(self._handle.close)
+
+
 async def run_single_task(
     orchestrator: Orchestrator,
     agent_name: str,
@@ -341,10 +474,20 @@ async def run_single_task(
     mode: OrchMode = OrchMode.MULTI,
     agent_config: AgentConfig | None = None,
     max_block_chars: int | None = None,
+    events_path: str | Path | None = None,
+    system_prompt: str | None = None,
+    trace_format: str = "formatted",
 ) -> dict[str, Any]:
-    """Run a single evaluation task and capture the full event trace."""
-    current_date = datetime.now(tz=timezone.utc).date().isoformat()
-    system_prompt = SYSTEM_PROMPT.replace("__CURRENT_DATE__", current_date)
+    """Run a single evaluation task and capture the full event trace.
+
+    When ``events_path`` is given, formatted events are streamed to it as NDJSON
+    while the task runs, and the result references that file instead of
+    embedding the events. ``system_prompt`` defaults to SYSTEM_PROMPT for the
+    current UTC date; batch callers pass it in to build it only once.
+    ``trace_format`` is one of TRACE_FORMATS; with "off" no event is recorded.
+    """
+    if system_prompt is None:
+        system_prompt = build_system_prompt()
     messages = [
         ChatMessage(role="system", content=system_prompt),
         ChatMessage(role="user", content=task.prompt),
@@ -357,6 +500,7 @@ async def run_single_task(
     )
 
     formatted_events: list[dict[str, Any]] = []
+    event_count = 0
     final_answer: str | None = None
     final_message: ChatMessage | None = None
     final_status = AgentRunningStatus.RUNNING.value
@@ -369,8 +513,10 @@ async def run_single_task(
     start_monotonic = time.perf_counter()
     started_at = datetime.now(tz=timezone.utc).isoformat()
 
+    events_sink: _EventSink | None = None
     try:
-        idx = 1
+        if events_path is not None and trace_format != "off":
+            events_sink = await _EventSink.open(events_path)
         async for event in orchestrator.run(
             agent_name=agent_name,
             event=entry_event,
@@ -378,8 +524,16 @@ async def run_single_task(
             mode=mode,
             context_id=task.id,
         ):
-            formatted_events.append(_format_event(event, idx, max_block_chars=max_block_chars))
-            idx += 1
+            event_count += 1
+            if trace_format != "off":
+                if trace_format == "raw":
+                    formatted_event = event.model_dump(mode="json")
+                else:
+                    formatted_event = _format_event(event, event_count, max_block_chars=max_block_chars)
+                if events_sink is not None:
+                    await events_sink.write(formatted_event)
+                else:
+                    formatted_events.append(formatted_event)
             if event.type == AgentEventType.ERROR and event.error:
                 error_message = event.error
                 saw_error = True
@@ -412,6 +566,9 @@ async def run_single_task(
         error_message = str(exc)
         final_status = AgentRunningStatus.ERROR.value
         saw_error = True
+    finally:
+        if events_sink is not None:
+            await events_sink.close()
 
     duration = time.perf_counter() - start_monotonic
     completed_at = datetime.now(tz=timezone.utc).isoformat()
@@ -433,7 +590,7 @@ async def run_single_task(
     task_section = {
         "id": task.id,
         "prompt": task.prompt,
-        "input_messages": [msg.model_dump() for msg in messages],
+        "input_messages": _MESSAGES_ADAPTER.dump_python(messages, mode="json"),
     }
 
     output_section = {
@@ -443,10 +600,12 @@ async def run_single_task(
         "error": error_message,
     }
 
-    trace_section = {
-        "event_count": len(formatted_events),
-        "events": formatted_events,
-    }
+    trace_section: dict[str, Any] = {"event_count": event_count, "format": trace_format}
+    if events_sink is not None:
+        # Relative to the result file, which is written to the same directory
+        trace_section["events_file"] = str(events_path).rsplit("/", 1)[-1]
+    elif trace_format != "off":
+        trace_section["events"] = formatted_events
 
     metadata_section = {
         "mode": mode.value,
@@ -466,48 +625,65 @@ async def run_single_task(
     return base_result
 
 
-def save_result(
-    result: dict[str, Any], output_dir: str | Path, overwrite: bool = False
-) -> str | Path:
-    """Persist a task result to disk or s3."""
-    task_id = result.get("task_id")
-    if not task_id:
-        raise ValueError("Result missing task_id; cannot name output file")
-
-    output_dir_str = str(output_dir)
-    is_s3 = megfile.is_s3(output_dir_str)
-    filename = f"{task_id}.json"
-    if is_s3:
-        megfile.smart_makedirs(output_dir_str, exist_ok=True)
-        base_path = output_dir_str.rstrip("/") + "/" + filename
-        target_path = base_path
-        if megfile.smart_exists(base_path) and not overwrite:
-            timestamp = datetime.now(tz=timezone.utc).strftime("%Y%m%d%H%M%S")
-            target_path = output_dir_str.rstrip("/") + f"/{task_id}_{timestamp}.json"
-            logger.warning(
-                "File %s exists, writing to %s instead. Use --overwrite to override.",
-                base_path,
-                target_path,
-            )
-        with megfile.smart_open(target_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
-        return target_path
+class ResultWriter:
+    """Writes task results, and names their event files, under one output directory (local or s3).
+
+    The directory is inspected and created once, when the writer is constructed.
+    """
 
-    output_dir_path = Path(output_dir_str)
-    output_dir_path.mkdir(parents=True, exist_ok=True)
-    base_path = output_dir_path / filename
-    target_path = base_path
-    if base_path.exists() and not overwrite:
+    def __init__(self, output_dir: str | Path, overwrite: bool = False):
+        output_dir_str = str(output_dir)
+        self.overwrite = overwrite
+        self.is_s3 = megfile.is_s3(output_dir_str)
+        if self.is_s3:
+            megfile.smart_makedirs(output_dir_str, exist_ok=True)
+            self._prefix = output_dir_str.rstrip("/") + "/"
+        else:
+            self._dir = Path(output_dir_str)
+            self._dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, filename: str) -> str | Path:
+        return self._prefix + filename if self.is_s3 else self._dir / filename
+
+    def _target_path(self, task_id: str, suffix: str) -> str | Path:
+        base_path = self._path(f"{task_id}{suffix}")
+        if self.overwrite or not megfile.smart_exists(base_path):
+            return base_path
         timestamp = datetime.now(tz=timezone.utc).strftime("%Y%m%d%H%M%S")
-        target_path = output_dir_path / f"{task_id}_{timestamp}.json"
+        target_path = self._path(f"{task_id}_{timestamp}{suffix}")
         logger.warning(
             "File %s exists, writing to %s instead. Use --overwrite to override.",
             base_path,
             target_path,
         )
-    with target_path.open("w", encoding="utf-8") as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
-    return target_path
+        return target_path
+
+    def events_path(self, task_id: str) -> str | Path:
+        """Pick the NDJSON file that a task's events are streamed to."""
+        return self._target_path(task_id, ".events.ndjson")
+
+    def write(self, result: dict[str, Any]) -> str | Path:
+        """Persist a task result and return where it was written."""
+        task_id = result.get("task_id")
+        if not task_id:
+            raise ValueError("Result missing task_id; cannot name output file")
+        target_path = self._target_path(task_id, ".json")
+        # Serialized up front so the file is written with a single call
+        payload = json_dumps_bytes(result, indent=2)
+        if self.is_s3:
+            with megfile.smart_open(target_path, "wb") as f:
+                f.write(payload)
+            return target_path
+
+        # Rename a finished sibling into place so a crash never leaves a partial result
+        tmp_path = target_path.with_name(f"{target_path.name}.tmp")
+        try:
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, target_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return target_path
 
 
 async def run_tasks(
@@ -520,33 +696,72 @@ async def run_tasks(
     request_timeout: float | None = None,
     context_upper_limit: int | None = None,
     context_lower_limit: int | None = None,
+    max_concurrency: int = 4,
+    trace_format: str = "formatted",
+    orchestrator: Orchestrator | None = None,
 ) -> list[str | Path]:
-    """Run all tasks sequentially and store per-task traces."""
-    orchestrator = build_orchestrator(agent_name)
-    written_files: list[str | Path] = []
-    for idx, task in enumerate(tasks, start=1):
-        logger.info("Running task %s/%s: %s", idx, len(tasks), task.id)
-        agent_config = build_agent_config(
-            streaming=streaming,
-            request_timeout=request_timeout,
-            context_upper_limit=context_upper_limit,
-            context_lower_limit=context_lower_limit,
-        )
-        result = await run_single_task(
-            orchestrator,
-            agent_name,
-            task,
-            mode,
-            agent_config=agent_config,
-        )
-        output_path = save_result(result, output_dir, overwrite=overwrite)
-        written_files.append(output_path)
-        logger.info(
-            "Task %s finished with status %s → %s",
-            task.id,
-            result["output"]["status"],
-            output_path,
+    """Run tasks concurrently (at most ``max_concurrency`` at a time) and store per-task traces.
+
+    Every task runs to completion; if any of them raised, the first error is
+    re-raised once the whole batch is done.
+    """
+    if orchestrator is None:
+        orchestrator = build_orchestrator(agent_name)
+    writer = ResultWriter(output_dir, overwrite=overwrite)
+    system_prompt = build_system_prompt()
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    # Agents only read their config, so every task can share this one
+    agent_config = build_agent_config(
+        streaming=streaming,
+        request_timeout=request_timeout,
+        context_upper_limit=context_upper_limit,
+        context_lower_limit=context_lower_limit,
+    )
+
+    async def run_and_save(idx: int, task: EvalTask) -> str | Path:
+        async with semaphore:
+            logger.info("Running task %s/%s: %s", idx, len(tasks), task.id)
+            result = await run_single_task(
+                orchestrator,
+                agent_name,
+                task,
+                mode,
+                agent_config=agent_config,
+                events_path=(
+                    None
+                    if trace_format == "off"
+                    else writer.events_path(task.id)
+                ),
+                system_prompt=system_prompt,
+                trace_format=trace_format,
+            )
+            output_path = writer.write(result)
+            logger.info(
+                "Task %s finished with status %s → %s",
+                task.id,
+                result["output"]["status"],
+                output_path,
+            )
+            return output_path
+
+    # The orchestrator keys all runner state by task id, so tasks can share it
+    async with http_session_scope():
+        outcomes = await asyncio.gather(
+            *(run_and_save(idx, task) for idx, task in enumerate(tasks, start=1)),
+            return_exceptions=True,
         )
+
+    written_files: list[str | Path] = []
+    failures: list[BaseException] = []
+    for task, outcome in zip(tasks, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error("Task %s failed", task.id, exc_info=outcome)
+            failures.append(outcome)
+            continue
+        written_files.append(outcome)
+    if failures:
+        logger.error("%s of %s task(s) failed", len(failures), len(tasks))
+        raise failures[0]
     return written_files
 
 
@@ -620,6 +835,16 @@ def parse_args() -> argparse.Namespace:
         type=int,
         help="Force-final-answer context lower token limit (overrides agent default).",
     )
+    parser.add_argument(
+        "--trace-format",
+        choices=TRACE_FORMATS,
+        help="How to record task events: formatted, raw model dumps, or off (default: formatted).",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        help="Maximum number of tasks to run at the same time (default: 4).",
+    )
     return parser.parse_args()
 
 
@@ -633,7 +858,7 @@ def configure_logging(level: str) -> None:
 def load_config_file(path: str | Path) -> dict[str, Any]:
     config_path = Path(path)
     with config_path.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+        data = yaml.load(f, Loader=_YAML_LOADER) or {}
     if not isinstance(data, dict):
         raise ValueError(f"Config file {config_path} must contain a mapping/object.")
     return data
@@ -675,6 +900,8 @@ def main() -> None:
         "request_timeout": None,
         "context_upper_limit": None,
         "context_lower_limit": None,
+        "max_concurrency": 4,
+        "trace_format": "formatted",
     }
     cli_args = parse_args()
     options, config_path = merge_with_config(cli_args, defaults)
@@ -686,32 +913,49 @@ def main() -> None:
             tasks_file = str((REPO_ROOT / tf_path).resolve())
 
     configure_logging(str(options.get("log_level", defaults["log_level"])))
+    options["tasks_file"] = tasks_file
+    asyncio.run(amain(options, defaults))
+
+
+async def amain(options: Mapping[str, Any], defaults: Mapping[str, Any]) -> list[str | Path]:
+    """Load tasks and build the orchestrator in parallel, then run the batch."""
     output_dir = Path(options.get("output_dir", defaults["output_dir"]))
+    agent_name = options.get("agent_name", defaults["agent_name"])
+    mode = OrchMode(options.get("mode", defaults["mode"]))
+    trace_format = str(options.get("trace_format", defaults["trace_format"]))
+    if trace_format not in TRACE_FORMATS:
+        raise ValueError(f"trace_format must be one of {', '.join(TRACE_FORMATS)}, got {trace_format!r}")
+    tasks_file = options.get("tasks_file")
 
-    tasks = merge_tasks(
-        single_task=options.get("task"),
-        single_task_id=options.get("task_id"),
-        tasks_file=Path(tasks_file) if tasks_file else None,
+    # Parsing the tasks file and setting up the agent are independent blocking steps
+    tasks, orchestrator = await asyncio.gather(
+        asyncio.to_thread(
+            merge_tasks,
+            single_task=options.get("task"),
+            single_task_id=options.get("task_id"),
+            tasks_file=Path(tasks_file) if tasks_file else None,
+        ),
+        asyncio.to_thread(build_orchestrator, agent_name),
     )
-    mode = OrchMode(options.get("mode", defaults["mode"]))
     logger.info(
         "Starting run: %s task(s), output → %s, mode=%s",
         len(tasks),
         output_dir,
         mode.value,
     )
-    asyncio.run(
-        run_tasks(
-            tasks=tasks,
-            agent_name=options.get("agent_name", defaults["agent_name"]),
-            output_dir=output_dir,
-            mode=mode,
-            overwrite=bool(options.get("overwrite", False)),
-            streaming=not bool(options.get("no_stream", False)),
-            request_timeout=options.get("request_timeout"),
-            context_upper_limit=options.get("context_upper_limit"),
-            context_lower_limit=options.get("context_lower_limit"),
-        )
+    return await run_tasks(
+        tasks=tasks,
+        agent_name=agent_name,
+        output_dir=output_dir,
+        mode=mode,
+        overwrite=bool(options.get("overwrite", False)),
+        streaming=not bool(options.get("no_stream", False)),
+        request_timeout=options.get("request_timeout"),
+        context_upper_limit=options.get("context_upper_limit"),
+        context_lower_limit=options.get("context_lower_limit"),
+        max_concurrency=int(options.get("max_concurrency", defaults["max_concurrency"])),
+        trace_format=trace_format,
+        orchestrator=orchestrator,
     )
 
 